@@ -7,6 +7,10 @@ This API is intentionally simple:
 - It delegates actual work to the MeshBot instance (send messages, read stats/history).
 - Responses are formatted with meta fields for easier client usage.
 
+Handlers are async: cheap work (auth, parameter normalization) runs on the event loop,
+while blocking bot calls are pushed to worker threads. DB reads (stats, user, history)
+use a small dedicated pool, so slow multipart sends cannot starve them.
+
 Auth
 ----
 Send a token as either:
@@ -29,39 +33,90 @@ The response includes:
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, List
+import asyncio
+import functools
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
 
-from fastapi import FastAPI, Header, HTTPException, Query
-from pydantic import BaseModel, Field
+import orjson
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 
 
-def _check_token(tokens: List[str], authorization: Optional[str], x_api_token: Optional[str]) -> None:
-    """
-    Validate API auth.
+# Auth header parameter declarations, shared by the verify_token dependency.
+_AUTH_HEADER = Header(default=None)
+_APITOK_HEADER = Header(default=None)
+
+# How long a serialized /stats response may be reused.
+STATS_TTL_SECONDS = 1.0
+
+# /health is polled often and its body never changes: serialize it once.
+_HEALTH_RESP = Response(content=b'{"ok":true}', media_type="application/json")
+
+
+class HistoryParams(NamedTuple):
+    """Normalized query params for history endpoints."""
+    order: str
+    sort_by: str
+    direction: Optional[str]
+    limit: int
 
-    If no tokens are configured, the API is effectively disabled (401).
+
+@functools.lru_cache(maxsize=256)
+def _normalize(order: str, sort_by: str, direction: Optional[str], limit: int) -> HistoryParams:
     """
-    if not tokens:
-        raise HTTPException(status_code=401, detail="No API tokens configured")
+    Normalize query params for history endpoints.
 
-    tok = None
+    order/sort_by/direction are already validated by the Query(pattern=...) declarations,
+    so they only need defaults here; limit is clamped defensively.
+    Pure over a small input domain, so results are memoized (the tuple is immutable).
+    """
+    if limit is None:
+        lim = 100
+    else:
+        lim = 1 if limit < 1 else (1000 if limit > 1000 else limit)
+    return HistoryParams(order or "desc", sort_by or "id", direction or None, lim)
 
-    # Prefer standard Authorization header
-    if authorization:
-        a = authorization.strip()
-        if a.lower().startswith("bearer "):
-            tok = a[7:].strip()
 
-    # Alternative header for convenience (e.g. curl)
-    if not tok and x_api_token:
-        tok = x_api_token.strip()
+def _cursor_bounds(items: List[Dict[str, Any]], order: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Compute paging cursors (next_before_id, next_after_id) for a history page.
 
-    if not tok or tok not in tokens:
-        raise HTTPException(status_code=401, detail="Unauthorized")
+    Single pass over the items: desc pages return the smallest id as next_before_id,
+    asc pages return the largest id as next_after_id.
+    SQLite ids are already ints, so int() is only applied as a fallback.
+    """
+    cur: Optional[int] = None
+    if order == "desc":
+        for it in items:
+            v = it.get("id")
+            if v is None:
+                continue
+            if type(v) is not int:
+                v = int(v)
+            if cur is None or v < cur:
+                cur = v
+        return cur, None
+    for it in items:
+        v = it.get("id")
+        if v is None:
+            continue
+        if type(v) is not int:
+            v = int(v)
+        if cur is None or v > cur:
+            cur = v
+    return None, cur
 
 
 class SendChannelReq(BaseModel):
     """POST body for sending a channel message."""
+    # Read-only request bodies: unknown fields are dropped and no assignment hooks are needed.
+    model_config = ConfigDict(extra="ignore", frozen=True, validate_assignment=False)
+
     channel: int = Field(..., ge=0)
     text: str
     node: Optional[str] = None
@@ -70,6 +125,8 @@ class SendChannelReq(BaseModel):
 
 class SendDMReq(BaseModel):
     """POST body for sending a DM."""
+    model_config = ConfigDict(extra="ignore", frozen=True, validate_assignment=False)
+
     user_id: str
     text: str
     node: Optional[str] = None
@@ -81,53 +138,134 @@ def create_app(bot: Any) -> FastAPI:
 
     'bot' is the MeshBot instance created by main.py.
     """
-    app = FastAPI(title="Meshtastic Bot API", version="3.0")
-
-    @app.get("/health")
-    def health() -> Dict[str, Any]:
+    # Dedicated pool for DB reads issued by the API.
+    db_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="api-db")
+
+    async def _db(fn: Callable[..., Any], **kwargs: Any) -> Any:
+        """Run a blocking bot/DB read on the API DB pool."""
+        return await asyncio.get_running_loop().run_in_executor(db_pool, functools.partial(fn, **kwargs))
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        """
+        Warn if the server is not running on uvloop.
+
+        uvicorn picks uvloop + httptools automatically when they are installed
+        (uvicorn[standard]); the pure-Python asyncio loop + h11 parser are much slower.
+        """
+        loop = asyncio.get_running_loop()
+        if not type(loop).__module__.startswith("uvloop"):
+            bot.log.warning(
+                "API event loop is %s, not uvloop. Install uvicorn[standard] "
+                "or run uvicorn with --loop uvloop --http httptools.",
+                type(loop).__name__,
+            )
+        try:
+            yield
+        finally:
+            db_pool.shutdown(wait=False)
+
+    app = FastAPI(title="Meshtastic Bot API", version="3.0", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+    # All handlers return plain JSON-native dicts, so routes declare response_model=None
+    # to skip FastAPI's per-response validation/jsonable_encoder pass.
+
+    # Tokens are fixed for the lifetime of the app: store their SHA-256 digests once.
+    # A presented token is hashed and looked up in the set, so the check is O(1) and
+    # its timing does not depend on how many characters of a real token matched.
+    token_digests = frozenset(hashlib.sha256(t.encode("utf-8")).digest() for t in (bot.cfg.api.tokens or ()))
+
+    def _auth(
+        authorization: Optional[str],
+        x_api_token: Optional[str],
+        _digests: FrozenSet[bytes] = token_digests,
+        _sha256: Any = hashlib.sha256,
+    ) -> None:
+        """
+        Validate API auth.
+
+        The digest set and hash function are bound as defaults so the per-request
+        check only touches local variables.
+        If no tokens are configured, the API is effectively disabled (401).
+        """
+        if not _digests:
+            raise HTTPException(status_code=401, detail="No API tokens configured")
+
+        tok = None
+
+        # Prefer standard Authorization header.
+        # Only the 7-char scheme prefix is lowercased (the server already strips
+        # surrounding whitespace from header values), not the whole token.
+        if authorization and len(authorization) > 7 and authorization[:7].lower() == "bearer ":
+            tok = authorization[7:].strip()
+
+        # Alternative header for convenience (e.g. curl)
+        if not tok and x_api_token:
+            tok = x_api_token.strip()
+
+        if not tok:
+            raise HTTPException(status_code=401, detail="Unauthorized")
+
+        if _sha256(tok.encode("utf-8")).digest() not in _digests:
+            raise HTTPException(status_code=401, detail="Unauthorized")
+
+    async def verify_token(
+        authorization: Optional[str] = _AUTH_HEADER,
+        x_api_token: Optional[str] = _APITOK_HEADER,
+    ) -> None:
+        """Auth dependency shared by all protected routes (async, so it stays on the event loop)."""
+        _auth(authorization, x_api_token)
+
+    async def require_ready() -> None:
+        """
+        Reject requests while the bot is still starting.
+
+        main.py starts the API before bot.start() so both initialize in parallel;
+        until the bot is ready, protected routes answer 503.
+        """
+        if not bot.is_ready():
+            raise HTTPException(status_code=503, detail="Bot is starting")
+
+    auth = [Depends(verify_token), Depends(require_ready)]
+
+    # (monotonic timestamp, serialized body) of the last /stats response
+    stats_cache: Optional[Tuple[float, bytes]] = None
+
+    @app.get("/health", response_model=None)
+    async def health() -> Response:
         """Simple health check (no auth)."""
-        return {"ok": True}
-
-    @app.get("/stats")
-    def stats(
-        authorization: Optional[str] = Header(default=None),
-        x_api_token: Optional[str] = Header(default=None),
-    ) -> Dict[str, Any]:
-        """Return bot and DB statistics."""
-        _check_token(bot.cfg.api.tokens, authorization, x_api_token)
-        return {"data": bot.get_stats()}
-
-    @app.get("/user/{node_id}")
-    def user(
+        return _HEALTH_RESP
+
+    @app.get("/stats", dependencies=auth, response_model=None)
+    async def stats() -> Response:
+        """
+        Return bot and DB statistics.
+
+        The serialized body is cached for STATS_TTL_SECONDS so aggressive monitoring
+        polls do not re-run the DB count queries on every request.
+        """
+        nonlocal stats_cache
+        now = time.monotonic()
+        if stats_cache is not None and now - stats_cache[0] < STATS_TTL_SECONDS:
+            return Response(content=stats_cache[1], media_type="application/json")
+        body = orjson.dumps({"data": await _db(bot.get_stats)})
+        stats_cache = (now, body)
+        return Response(content=body, media_type="application/json")
+
+    @app.get("/user/{node_id}", dependencies=auth, response_model=None)
+    async def user(
         node_id: str,
         name_limit: int = Query(50, ge=1, le=500),
         name_order: str = Query("desc", pattern="^(asc|desc)$"),
-        authorization: Optional[str] = Header(default=None),
-        x_api_token: Optional[str] = Header(default=None),
     ) -> Dict[str, Any]:
         """Return station info and name history for a given node_id."""
-        _check_token(bot.cfg.api.tokens, authorization, x_api_token)
-        info = bot.get_user_info(node_id=node_id, name_limit=int(name_limit), name_order=name_order)
+        info = await _db(bot.get_user_info, node_id=node_id, name_limit=name_limit, name_order=name_order)
         if not info:
             raise HTTPException(status_code=404, detail="Not found")
         return {"data": info}
 
-    def _normalize(order: str, sort_by: str, direction: Optional[str], limit: int) -> Dict[str, Any]:
-        """Normalize and validate query params for history endpoints."""
-        ord_norm = (order or "desc").lower().strip()
-        if ord_norm not in ("asc", "desc"):
-            ord_norm = "desc"
-        sort_norm = (sort_by or "id").lower().strip()
-        if sort_norm not in ("id", "ts"):
-            sort_norm = "id"
-        dir_norm = (direction or "").lower().strip() or None
-        if dir_norm not in (None, "rx", "tx"):
-            dir_norm = None
-        lim = max(1, min(int(limit), 1000))
-        return {"order": ord_norm, "sort_by": sort_norm, "direction": dir_norm, "limit": lim}
-
-    @app.get("/history/channel/{channel}")
-    def history_channel(
+    @app.get("/history/channel/{channel}", dependencies=auth, response_class=ORJSONResponse, response_model=None)
+    async def history_channel(
         channel: int,
         limit: int = Query(100, ge=1, le=1000),
         order: str = Query("desc", pattern="^(asc|desc)$"),
@@ -135,52 +273,45 @@ def create_app(bot: Any) -> FastAPI:
         before_id: Optional[int] = None,
         after_id: Optional[int] = None,
         direction: Optional[str] = Query(None, pattern="^(rx|tx)$"),
-        authorization: Optional[str] = Header(default=None),
-        x_api_token: Optional[str] = Header(default=None),
-    ) -> Dict[str, Any]:
+    ) -> ORJSONResponse:
         """Return history for a channel conversation."""
-        _check_token(bot.cfg.api.tokens, authorization, x_api_token)
+        # Path params are already coerced by FastAPI (channel: int, peer_id: str).
         n = _normalize(order, sort_by, direction, limit)
 
-        items = bot.get_history_channel(
-            channel=int(channel),
-            limit=n["limit"],
-            order=n["order"],
-            sort_by=n["sort_by"],
+        items = await _db(
+            bot.get_history_channel,
+            channel=channel,
+            limit=n.limit,
+            order=n.order,
+            sort_by=n.sort_by,
             before_id=before_id,
             after_id=after_id,
-            direction=n["direction"],
+            direction=n.direction,
         )
 
         # History responses include a meta object with paging cursors.
         # - When order=desc, use next_before_id to fetch older messages.
         # - When order=asc, use next_after_id to fetch newer messages.
-        next_before = None
-        next_after = None
-        if items:
-            ids = [int(it["id"]) for it in items if "id" in it]
-            if n["order"] == "desc":
-                next_before = min(ids)
-            else:
-                next_after = max(ids)
-
-        return {
+        next_before, next_after = _cursor_bounds(items, n.order)
+
+        # Rows from the DB layer are already JSON-native, so hand them straight to orjson.
+        return ORJSONResponse({
             "items": items,
             "meta": {
-                "conversation": {"type": "channel", "channel": int(channel)},
-                "limit": n["limit"],
-                "order": n["order"],
-                "sort_by": n["sort_by"],
-                "direction": n["direction"],
+                "conversation": {"type": "channel", "channel": channel},
+                "limit": n.limit,
+                "order": n.order,
+                "sort_by": n.sort_by,
+                "direction": n.direction,
                 "before_id": before_id,
                 "after_id": after_id,
                 "next_before_id": next_before,
                 "next_after_id": next_after,
             },
-        }
+        })
 
-    @app.get("/history/dm/{peer_id}")
-    def history_dm(
+    @app.get("/history/dm/{peer_id}", dependencies=auth, response_class=ORJSONResponse, response_model=None)
+    async def history_dm(
         peer_id: str,
         limit: int = Query(100, ge=1, le=1000),
         order: str = Query("desc", pattern="^(asc|desc)$"),
@@ -188,67 +319,49 @@ def create_app(bot: Any) -> FastAPI:
         before_id: Optional[int] = None,
         after_id: Optional[int] = None,
         direction: Optional[str] = Query(None, pattern="^(rx|tx)$"),
-        authorization: Optional[str] = Header(default=None),
-        x_api_token: Optional[str] = Header(default=None),
-    ) -> Dict[str, Any]:
+    ) -> ORJSONResponse:
         """Return history for a DM conversation."""
-        _check_token(bot.cfg.api.tokens, authorization, x_api_token)
         n = _normalize(order, sort_by, direction, limit)
 
-        items = bot.get_history_dm(
-            peer=str(peer_id),
-            limit=n["limit"],
-            order=n["order"],
-            sort_by=n["sort_by"],
+        items = await _db(
+            bot.get_history_dm,
+            peer=peer_id,
+            limit=n.limit,
+            order=n.order,
+            sort_by=n.sort_by,
             before_id=before_id,
             after_id=after_id,
-            direction=n["direction"],
+            direction=n.direction,
         )
 
-        next_before = None
-        next_after = None
-        if items:
-            ids = [int(it["id"]) for it in items if "id" in it]
-            if n["order"] == "desc":
-                next_before = min(ids)
-            else:
-                next_after = max(ids)
+        next_before, next_after = _cursor_bounds(items, n.order)
 
-        return {
+        # Rows from the DB layer are already JSON-native, so hand them straight to orjson.
+        return ORJSONResponse({
             "items": items,
             "meta": {
-                "conversation": {"type": "dm", "peer_id": str(peer_id)},
-                "limit": n["limit"],
-                "order": n["order"],
-                "sort_by": n["sort_by"],
-                "direction": n["direction"],
+                "conversation": {"type": "dm", "peer_id": peer_id},
+                "limit": n.limit,
+                "order": n.order,
+                "sort_by": n.sort_by,
+                "direction": n.direction,
                 "before_id": before_id,
                 "after_id": after_id,
                 "next_before_id": next_before,
                 "next_after_id": next_after,
             },
-        }
+        })
 
-    @app.post("/send/channel")
-    def send_channel(
-        req: SendChannelReq,
-        authorization: Optional[str] = Header(default=None),
-        x_api_token: Optional[str] = Header(default=None),
-    ) -> Dict[str, Any]:
+    @app.post("/send/channel", dependencies=auth, response_model=None)
+    async def send_channel(req: SendChannelReq) -> Dict[str, Any]:
         """Send a message to a channel (broadcast by default)."""
-        _check_token(bot.cfg.api.tokens, authorization, x_api_token)
-        ok = bot.api_send_channel(channel=req.channel, text=req.text, node=req.node, destination_id=req.destination_id)
+        ok = await asyncio.to_thread(bot.api_send_channel, channel=req.channel, text=req.text, node=req.node, destination_id=req.destination_id)
         return {"ok": ok}
 
-    @app.post("/send/dm")
-    def send_dm(
-        req: SendDMReq,
-        authorization: Optional[str] = Header(default=None),
-        x_api_token: Optional[str] = Header(default=None),
-    ) -> Dict[str, Any]:
+    @app.post("/send/dm", dependencies=auth, response_model=None)
+    async def send_dm(req: SendDMReq) -> Dict[str, Any]:
         """Send a DM to a user."""
-        _check_token(bot.cfg.api.tokens, authorization, x_api_token)
-        ok = bot.api_send_dm(user_id=req.user_id, text=req.text, node=req.node)
+        ok = await asyncio.to_thread(bot.api_send_dm, user_id=req.user_id, text=req.text, node=req.node)
         return {"ok": ok}
 
     return app
@@ -18,6 +18,7 @@ Important message rules
 - All outgoing messages are limited to MAX_LEN = 190 characters.
 - If a message exceeds MAX_LEN, it is split into numbered parts "1/N ...".
 - If multiple parts are sent, there is a delay of MULTIPART_DELAY_SECONDS (2s) between parts.
+  Parts are queued per node and sent by a TX thread, so callers do not block on the delay.
 
 Notes about Meshtastic data model
 --------------------------------
@@ -36,23 +37,32 @@ We also see:
 
 from __future__ import annotations
 
+import collections
+import datetime
+import functools
+import heapq
+import itertools
 import json
 import logging
 import queue
+import re
+import socket
+import sys
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple, List
+from typing import Any, Callable, Dict, Optional, Set, Tuple, List
 
 from zoneinfo import ZoneInfo
 
 import requests
+from requests.adapters import HTTPAdapter
 from pubsub import pub
 from meshtastic.tcp_interface import TCPInterface
 
-from .config import AppCfg
+from .config import AppCfg, CommandCfg
 from .db import BotDB
-from .plugins import PluginManager
+from .plugins import Meta, PluginManager
 
 # Botversion
 BOTVERSION = "2.01"
@@ -69,6 +79,39 @@ MULTIPART_DELAY_SECONDS = 2
 # Meshtastic uses 0xFFFFFFFF for broadcast ("to everyone")
 BROADCAST_TO_NUM = 0xFFFFFFFF
 
+# How often connect_loop wakes up while connected (seconds). Dead connections are
+# reported by Meshtastic ("meshtastic.connection.lost") and by TCP keepalive.
+LIVENESS_WAIT_SECONDS = 30
+
+# Built-in command triggers, matched case-insensitively in this order
+BUILTIN_COMMANDS = ("/help", "/ping", "/user", "/stats")
+
+# Max number of text packets waiting for _loop; further packets are dropped
+RX_QUEUE_MAX = 1024
+
+# Max number of RX messages the bot loop handles per wake-up
+RX_BATCH_MAX = 64
+
+# Max number of webhook payloads waiting to be posted; further payloads are dropped
+WEBHOOK_QUEUE_MAX = 1000
+
+# How long the webhook worker collects messages for one batch (webhook.batch_size > 1)
+WEBHOOK_FLUSH_SECONDS = 1.0
+
+# Webhook circuit breaker: after this many consecutive failed POSTs, messages are
+# dropped for an exponential backoff window (2**failures seconds, capped)
+WEBHOOK_BREAKER_FAILURES = 5
+WEBHOOK_BREAKER_MAX_SECONDS = 300
+
+# Max number of queued DB writes (stations, names, messages); further writes are dropped
+DB_WRITE_QUEUE_MAX = 10000
+
+# Max number of queued DB writes applied to SQLite in one transaction
+DB_WRITE_BATCH = 500
+
+# Max seconds a read waits for queued DB writes (flush_writes); after that it reads slightly stale data
+DB_FLUSH_TIMEOUT_SECONDS = 2.0
+
 
 def install_trace_level() -> None:
     """
@@ -95,6 +138,10 @@ def json_default(o: Any) -> Any:
     return str(o)
 
 
+# Shared encoder for TRACE payload logging (avoids building a new encoder per call)
+_TRACE_ENCODER = json.JSONEncoder(ensure_ascii=False, default=json_default).encode
+
+
 def make_jsonable(obj: Any) -> Any:
     """
     Convert an arbitrary object into something JSON-serializable.
@@ -114,15 +161,18 @@ def make_jsonable(obj: Any) -> Any:
     return str(obj)
 
 
-def _chunk_text(text: str, max_len: int = MAX_LEN) -> List[str]:
+@functools.lru_cache(maxsize=256)
+def _chunk_text(text: str, max_len: int = MAX_LEN) -> Tuple[str, ...]:
     """
     Split a long message into parts that fit MAX_LEN.
 
     Parts are prefixed with "i/N " for better readability on the receiving device.
+    Results are memoized (as an immutable tuple) because scheduled messages, heartbeats
+    and /help resend the same text over and over.
     """
     t = (text or "").strip()
     if len(t) <= max_len:
-        return [t]
+        return (t,)
 
     raw_parts: List[str] = []
     i = 0
@@ -136,7 +186,18 @@ def _chunk_text(text: str, max_len: int = MAX_LEN) -> List[str]:
         prefix = f"{idx}/{total} "
         allowed = max_len - len(prefix)
         parts.append(prefix + part[:allowed])
-    return parts
+    return tuple(parts)
+
+
+@functools.lru_cache(maxsize=128)
+def _fmt_utc(ts: int) -> str:
+    """
+    Format epoch seconds for chat replies.
+
+    We intentionally use UTC in responses for consistent interpretation.
+    Memoized: /user replies format the same name-history timestamps again and again.
+    """
+    return time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(ts))
 
 
 def _norm_name_val(v: Any) -> Optional[str]:
@@ -155,6 +216,12 @@ def _norm_name_val(v: Any) -> Optional[str]:
     return s if s else None
 
 
+# Name key variants seen in "user" dicts, most common first
+# (the Meshtastic python library emits shortName/longName).
+_SHORT_KEYS = ("shortName", "shortname", "short_name", "nameShort", "name_short", "name_short_name", "short")
+_LONG_KEYS = ("longName", "longname", "long_name", "nameLong", "name_long", "nameLongName", "long")
+
+
 def _extract_names_from_user_dict(user: Any) -> Tuple[Optional[str], Optional[str]]:
     """
     Extract (short,long) from a "user" dict with many possible key variants.
@@ -162,17 +229,9 @@ def _extract_names_from_user_dict(user: Any) -> Tuple[Optional[str], Optional[st
     if not isinstance(user, dict):
         return None, None
 
-    # Common Meshtastic python keys
-    short = (
-        user.get("shortName") or user.get("shortname") or user.get("short_name")
-        or user.get("nameShort") or user.get("name_short") or user.get("name_short_name")
-        or user.get("short")
-    )
-    long = (
-        user.get("longName") or user.get("longname") or user.get("long_name")
-        or user.get("nameLong") or user.get("name_long") or user.get("nameLongName")
-        or user.get("long")
-    )
+    # First non-empty value wins; stops at the first hit (usually the first key).
+    short = next((v for v in map(user.get, _SHORT_KEYS) if v), None)
+    long = next((v for v in map(user.get, _LONG_KEYS) if v), None)
     return _norm_name_val(short), _norm_name_val(long)
 
 
@@ -282,46 +341,18 @@ def _derive_from_id(packet: Dict[str, Any]) -> str:
         return ""
 
 
-def _packet_ts(packet: Dict[str, Any]) -> int:
+def _packet_ts(packet: Dict[str, Any], now: Optional[int] = None) -> int:
     """
     Extract a timestamp from packet metadata if available.
 
     - Some packets include rxTime (epoch seconds).
-    - If not present, use current time.
+    - If not present, use 'now' (or the current time).
     """
     for k in ("rxTime", "rx_time", "rxTimeSec"):
         v = packet.get(k)
         if isinstance(v, (int, float)) and v > 0:
             return int(v)
-    return int(time.time())
-
-
-def _channel_index(packet: Dict[str, Any]) -> int:
-    """Extract channel index (int) from packet."""
-    decoded = packet.get("decoded", {}) or {}
-    ch = decoded.get("channel", packet.get("channel", 0))
-    try:
-        if isinstance(ch, str):
-            return int(ch, 0)
-        return int(ch)
-    except Exception:
-        return 0
-
-
-def _is_text_packet(packet: Dict[str, Any]) -> bool:
-    """Return True if packet looks like a text message."""
-    decoded = packet.get("decoded", {}) or {}
-    if decoded.get("portnum") == "TEXT_MESSAGE_APP":
-        return True
-    t = decoded.get("text")
-    return isinstance(t, str) and bool(t.strip())
-
-
-def _get_text(packet: Dict[str, Any]) -> str:
-    """Extract decoded text message."""
-    decoded = packet.get("decoded", {}) or {}
-    t = decoded.get("text")
-    return t.strip() if isinstance(t, str) else ""
+    return now if now is not None else int(time.time())
 
 
 def _is_broadcast(packet: Dict[str, Any]) -> bool:
@@ -348,9 +379,68 @@ def _is_broadcast(packet: Dict[str, Any]) -> bool:
     return str(to_id).lower() in ("!ffffffff", "ffffffff", "0xffffffff", "^all")
 
 
-def _reply_dest(packet: Dict[str, Any], from_id: str) -> str:
-    """Return destinationId for replies: '^all' for channel messages, else sender ID for DMs."""
-    return "^all" if _is_broadcast(packet) else from_id
+@dataclass(slots=True, frozen=True)
+class PacketView:
+    """
+    The fields of an RX packet the bot works with, extracted once per packet.
+
+    - is_text: looks like a text message (TEXT_MESSAGE_APP or non-empty decoded text)
+    - text: decoded text, stripped ("" if none)
+    - channel: channel index (0 if missing/unparseable)
+    - is_broadcast: see _is_broadcast()
+    - short/long: sender names from the packet, else from interface.nodes (may be None)
+
+    Hop count and transport (_hops/_via) are only needed by /ping and are read on demand.
+    """
+    is_text: bool
+    text: str
+    channel: int
+    is_broadcast: bool
+    from_id: str
+    from_num: Optional[int]
+    ts: int
+    short: Optional[str]
+    long: Optional[str]
+
+
+def classify_packet(packet: Dict[str, Any], now: Optional[int] = None, interface: Any = None) -> PacketView:
+    """
+    Build a PacketView, reading packet["decoded"] only once.
+
+    If 'interface' is given, it is used as a fallback source for sender names.
+    """
+    decoded = packet.get("decoded") or {}
+
+    t = decoded.get("text")
+    text = t.strip() if isinstance(t, str) else ""
+    is_text = decoded.get("portnum") == "TEXT_MESSAGE_APP" or bool(text)
+
+    ch = decoded.get("channel", packet.get("channel", 0))
+    try:
+        channel = int(ch, 0) if isinstance(ch, str) else int(ch)
+    except Exception:
+        channel = 0
+
+    from_id = _derive_from_id(packet)
+    from_num = _derive_from_num(packet)
+
+    short, long = _extract_names_from_packet(packet)
+    if (not short) and (not long) and from_id and interface is not None:
+        s2, l2 = _extract_names_from_interface(interface, from_id, from_num)
+        short = short or s2
+        long = long or l2
+
+    return PacketView(
+        is_text=is_text,
+        text=text,
+        channel=channel,
+        is_broadcast=_is_broadcast(packet),
+        from_id=from_id,
+        from_num=from_num,
+        ts=_packet_ts(packet, now),
+        short=short,
+        long=long,
+    )
 
 
 def _hops(packet: Dict[str, Any]) -> int:
@@ -380,6 +470,32 @@ def _via(packet: Dict[str, Any]) -> str:
         return "LoRa"
 
 
+# Weekday names as used in [schedules] items (index = datetime.weekday())
+_WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+@dataclass(slots=True)
+class _SchedItem:
+    """A schedule item normalized once at startup (see MeshBot._compile_schedules)."""
+    time: str
+    day_mask: int  # bit n set = fires on _WEEKDAYS[n]
+    channel: int
+    dest: str
+    node: str
+    text: str
+    keys: Tuple[str, ...]  # per-minute guard key for each weekday (index = datetime.weekday())
+
+
+@dataclass(slots=True)
+class _HBConfig:
+    """Heartbeat settings normalized once at startup (see MeshBot._compile_heartbeat)."""
+    interval: int
+    message: str
+    mode: str
+    targets: Tuple[str, ...]
+    channel: int
+
+
 @dataclass
 class Incoming:
     """
@@ -388,12 +504,9 @@ class Incoming:
     We store fields that are frequently needed by the bot loop.
     """
     packet: Dict[str, Any]
+    view: PacketView
     node_key: str
     iface: Any
-    ts: int
-    from_id: str
-    short: Optional[str]
-    long: Optional[str]
 
 
 class NodeClient:
@@ -403,6 +516,10 @@ class NodeClient:
     - Connects using meshtastic.tcp_interface.TCPInterface(hostname, portNumber).
     - Reconnects on errors with exponential backoff.
     - send_text() enforces message splitting and delay.
+
+    send_text() does not block: message parts are pushed onto a deadline heap and sent
+    by tx_pump() (one thread per node), so a multipart reply does not stall the caller
+    for MULTIPART_DELAY_SECONDS per part.
     """
 
     def __init__(self, host: str, port: int, name: str, on_iface: Any, on_tx: Any, log: logging.Logger) -> None:
@@ -423,6 +540,37 @@ class NodeClient:
 
         self.log = log
 
+        # Pending TX parts: (monotonic deadline, seq, part, destination_id, channel_index).
+        # seq keeps parts with equal deadlines in submission order.
+        self._tx_heap: List[Tuple[float, int, str, str, int]] = []
+        self._tx_cond = threading.Condition()
+        self._tx_seq = itertools.count()
+        # Earliest monotonic time the next message may start; keeps messages serialized
+        # (all parts of one message before the next) and MULTIPART_DELAY_SECONDS apart.
+        self._tx_next_free = 0.0
+
+        # Set when Meshtastic reports the connection as lost (or on close) to wake connect_loop
+        self._lost = threading.Event()
+
+    def mark_lost(self) -> None:
+        """Called by MeshBot when Meshtastic publishes meshtastic.connection.lost for our iface."""
+        self._lost.set()
+
+    def _enable_keepalive(self) -> None:
+        """Enable TCP keepalive on the interface socket so the kernel detects dead peers."""
+        sock = getattr(self.iface, "socket", None) or getattr(self.iface, "_socket", None)
+        if not isinstance(sock, socket.socket):
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            # Linux-specific tuning; not available on every platform
+            if hasattr(socket, "TCP_KEEPIDLE"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+        except OSError as e:
+            self.log.debug("[%s] could not enable TCP keepalive: %r", self.key, e)
+
     def connect_loop(self) -> None:
         """
         Background loop that keeps the TCP interface alive.
@@ -436,7 +584,9 @@ class NodeClient:
         while not self.stop_event.is_set():
             try:
                 # NOTE: meshtastic uses the parameter name portNumber (not 'port')
+                self._lost.clear()
                 self.iface = TCPInterface(hostname=self.host, portNumber=self.port)
+                self._enable_keepalive()
 
                 # Let MeshBot know that this interface belongs to this node_key
                 self._on_iface(self.iface, self.key)
@@ -446,9 +596,13 @@ class NodeClient:
                 backoff = 2
 
                 # Keep the connection alive; Meshtastic has its own reader thread.
+                # Sleep until the connection is reported lost (or we are stopped)
+                # instead of polling the interface every second.
                 while not self.stop_event.is_set():
-                    time.sleep(1)
-                    _ = getattr(self.iface, "nodes", None)  # touch nodes to detect interface issues
+                    if self._lost.wait(LIVENESS_WAIT_SECONDS):
+                        if self.stop_event.is_set():
+                            break
+                        raise ConnectionError("connection lost")
             except Exception as e:
                 # Connection failed or got dropped: clear flag and retry.
                 self.connected.clear()
@@ -465,6 +619,9 @@ class NodeClient:
     def close(self) -> None:
         """Stop this client and close its TCP interface."""
         self.stop_event.set()
+        self._lost.set()
+        with self._tx_cond:
+            self._tx_cond.notify_all()
         self.connected.clear()
         try:
             if self.iface:
@@ -475,49 +632,81 @@ class NodeClient:
 
     def send_text(self, text: str, destination_id: str, channel_index: int) -> bool:
         """
-        Send a text message via Meshtastic.
+        Queue a text message for sending via Meshtastic.
 
         Important:
         - Enforces MAX_LEN by splitting into numbered parts.
-        - If multiple parts are needed, waits MULTIPART_DELAY_SECONDS between parts.
-        - Uses TCPInterface.sendText(text, destinationId=..., channelIndex=...).
+        - Parts are scheduled MULTIPART_DELAY_SECONDS apart and sent by tx_pump().
+          A message starts only after the previous one on this node (plus the delay),
+          so parts of concurrent messages never interleave.
+        - Returns True if the message was queued, False if the node is not connected.
+          Send errors are logged by tx_pump().
         """
         if not self.iface or not self.connected.is_set():
             return False
 
         parts = _chunk_text(text, MAX_LEN)
-        ok_all = True
-
-        for i, part in enumerate(parts):
-            try:
-                self.log.debug("[%s] TX dest=%s ch=%s text=%r", self.key, destination_id, channel_index, part)
-
-                # TRACE prints full payload as JSON (safe conversion for bytes)
-                if self.log.isEnabledFor(TRACE):
-                    self.log.trace(
-                        "[%s] TX payload=%s",
-                        self.key,
-                        json.dumps({"dest": destination_id, "ch": channel_index, "text": part},
-                                   ensure_ascii=False, default=json_default),
-                    )
+        with self._tx_cond:
+            start = max(time.monotonic(), self._tx_next_free)
+            for i, part in enumerate(parts):
+                heapq.heappush(
+                    self._tx_heap,
+                    (start + i * MULTIPART_DELAY_SECONDS, next(self._tx_seq), part, destination_id, channel_index),
+                )
+            self._tx_next_free = start + len(parts) * MULTIPART_DELAY_SECONDS
+            self._tx_cond.notify()
+        return True
 
-                # This is the actual Meshtastic send
-                self.iface.sendText(part, destinationId=destination_id, channelIndex=channel_index)
+    def tx_pump(self) -> None:
+        """
+        Background loop that sends queued message parts once their deadline is due.
 
-                # Notify MeshBot for DB storage of TX messages
-                try:
-                    self._on_tx(self.key, part, destination_id, channel_index)
-                except Exception:
-                    pass
+        Runs until stop_event is set.
+        """
+        while not self.stop_event.is_set():
+            with self._tx_cond:
+                item = None
+                while not self.stop_event.is_set():
+                    if self._tx_heap:
+                        delay = self._tx_heap[0][0] - time.monotonic()
+                        if delay <= 0:
+                            item = heapq.heappop(self._tx_heap)
+                            break
+                        self._tx_cond.wait(delay)
+                    else:
+                        self._tx_cond.wait(1.0)
+            if item is None:
+                return
+            _, _, part, destination_id, channel_index = item
+            self._send_part(part, destination_id, channel_index)
+
+    def _send_part(self, part: str, destination_id: str, channel_index: int) -> None:
+        """Send one message part and notify MeshBot for TX history."""
+        iface = self.iface
+        if not iface or not self.connected.is_set():
+            self.log.warning("[%s] dropping queued part (not connected): dest=%s ch=%s", self.key, destination_id, channel_index)
+            return
+        try:
+            self.log.debug("[%s] TX dest=%s ch=%s text=%r", self.key, destination_id, channel_index, part)
+
+            # TRACE prints full payload as JSON (safe conversion for bytes)
+            if self.log.isEnabledFor(TRACE):
+                self.log.trace(
+                    "[%s] TX payload=%s",
+                    self.key,
+                    _TRACE_ENCODER({"dest": destination_id, "ch": channel_index, "text": part}),
+                )
 
-                # Delay between parts
-                if len(parts) > 1 and i < (len(parts) - 1):
-                    time.sleep(MULTIPART_DELAY_SECONDS)
-            except Exception as e:
-                self.log.error("[%s] send error: %r", self.key, e)
-                ok_all = False
+            # This is the actual Meshtastic send
+            iface.sendText(part, destinationId=destination_id, channelIndex=channel_index)
 
-        return ok_all
+            # Notify MeshBot for DB storage of TX messages
+            try:
+                self._on_tx(self.key, part, destination_id, channel_index)
+            except Exception:
+                pass
+        except Exception as e:
+            self.log.error("[%s] send error: %r", self.key, e)
 
 
 class MeshBot:
@@ -527,7 +716,10 @@ class MeshBot:
     Thread model:
     - Meshtastic RX callback runs in pubsub context and enqueues Incoming events.
     - A bot-loop thread dequeues events, stores them, and replies.
-    - A scheduler thread ticks once per second and sends scheduled messages.
+    - A scheduler thread ticks once per minute and sends scheduled messages.
+    - One TX thread per node sends queued message parts (NodeClient.tx_pump).
+    - A DB writer thread persists queued stations, names and RX/TX history in batched transactions.
+    - A webhook thread posts queued RX payloads (only if webhook.url is set).
     - The FastAPI server runs in another thread (started in main.py).
 
     Conversation behaviour:
@@ -543,20 +735,50 @@ class MeshBot:
         # One NodeClient per configured node
         self.clients: Dict[str, NodeClient] = {}
         self.node_name_by_key: Dict[str, str] = {}
-
-        # Map TCPInterface objects to node keys (host:port)
-        self._iface_to_key: Dict[int, str] = {}
-        self._iface_lock = threading.Lock()
-
-        # Incoming message queue; filled by _on_receive, drained by _loop
-        self._q: "queue.Queue[Incoming]" = queue.Queue()
+        # Lookup index for get_client(): node name and node key -> NodeClient
+        self._clients_by_name: Dict[str, NodeClient] = {}
+
+        # Incoming message queue; filled by _on_receive, drained by _loop.
+        # A deque + Event instead of queue.Queue: append/popleft are atomic, so the
+        # hot path takes no lock; the Event only wakes the idle loop.
+        # Bounded so an RX flood cannot grow memory without limit.
+        self._q: "collections.deque[Incoming]" = collections.deque(maxlen=RX_QUEUE_MAX)
+        self._q_evt = threading.Event()
+        self.rx_dropped = 0
         self._stop = threading.Event()
-
-        # Heartbeat state
-        self._last_hb = 0.0
+        # Set once start() has finished (see is_ready())
+        self._ready = threading.Event()
+
+        # Write-behind queue of (kind, args) DB writes; drained by _db_writer_loop (see BotDB.write_batch)
+        self._write_q: "queue.Queue[Tuple[str, Tuple[Any, ...]]]" = queue.Queue(maxsize=DB_WRITE_QUEUE_MAX)
+        # Writes queued / applied so far (FIFO, so "applied >= n" means the first n are done).
+        # flush_writes() waits on _write_cv for the count it saw, not for an empty queue.
+        self._write_cv = threading.Condition()
+        self._writes_queued = 0
+        self._writes_applied = 0
+        self._db_writer: Optional[threading.Thread] = None
+        # Set by stop() before the final flush; later writes are dropped (the DB is closing)
+        self._writes_closed = False
+        self._loop_thread: Optional[threading.Thread] = None
+
+        # Webhook payload queue; drained by _webhook_loop over a pooled keep-alive session
+        self._wh_q: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=WEBHOOK_QUEUE_MAX)
+        self._wh_sess: Optional[requests.Session] = None
+        # Circuit breaker state (see _webhook_loop)
+        self._wh_fail_count = 0
+        self._wh_skip_until = 0.0
+
+        # Heartbeat state (time.monotonic() of the last heartbeat; None = not sent yet)
+        self._last_hb: Optional[float] = None
+        self._hb_cfg: Optional[_HBConfig] = None
 
         # Scheduler state: ensure one send per minute per schedule item
-        self._sched_last_sent: Dict[str, int] = {}
+        # Keys fired in the current minute only, so the guard cannot grow over time.
+        self._sched_minute = -1
+        self._sched_fired: Set[str] = set()
+        # Compiled schedule (see _compile_schedules): items bucketed by "HH:MM"
+        self._tz: Optional[ZoneInfo] = None
+        self._sched_by_hhmm: Dict[str, List[_SchedItem]] = {}
 
         # Persistent storage
         self.db = BotDB(self.cfg.db.path)
@@ -566,9 +788,149 @@ class MeshBot:
 
         # Stats
         self.start_time = time.time()
+        # Uptime is measured on the monotonic clock, so wall-clock steps do not distort it.
+        self._start_mono = time.monotonic()
+
+        # Wall clock in whole seconds, refreshed by the bot loop (at least twice per second).
+        # Used for DB timestamps on the RX/TX paths, where one second of staleness is fine.
+        self._now_s = int(self.start_time)
+        # (second, ISO-8601 string) of the last formatted webhook timestamp
+        self._ts_cache: Tuple[int, str] = (0, "")
         self.rx_messages = 0
         self.tx_messages = 0
 
+        # Precompiled command matching / blocking (see _compile_commands)
+        self._trigger_re: Optional["re.Pattern[str]"] = None
+        self._trigger_keys: List[str] = []
+        self._trigger_cmds: List[Optional[CommandCfg]] = []  # None for built-ins
+        self._block_channels: Dict[str, frozenset] = {}
+        self._block_dm: frozenset = frozenset()
+        self._allowed_channels: Optional[frozenset] = None  # None = all channels
+        self._commands_enabled = False
+        # Which plugin callbacks have at least one implementer (set in start()).
+        # Hot paths skip building arguments for and calling empty dispatchers.
+        self._plugin_commands = False
+        self._plugin_packet = False
+        self._plugin_text = False
+        self._plugin_tick = False
+        # channel_name() results per channel index
+        self._channel_names: Dict[int, str] = {}
+        # Webhook "node" objects per node key (see _post_webhook)
+        self._wh_nodes: Dict[str, Dict[str, Any]] = {}
+        self._help_text = ""
+        # Built-in command key (see BUILTIN_COMMANDS) -> handler
+        self._builtin_handlers: Dict[str, Callable[[str, Incoming, NodeClient, str, int], None]] = {
+            "/help": self._h_help,
+            "/ping": self._h_ping,
+            "/user": self._h_user,
+            "/stats": self._h_stats,
+        }
+        self._compile_commands()
+        self._compile_schedules()
+        self._compile_heartbeat()
+
+    def _compile_heartbeat(self) -> None:
+        """
+        Normalize heartbeat settings once; None if the heartbeat is disabled.
+
+        Call again if the heartbeat config changes.
+        """
+        hb = self.cfg.heartbeat
+        if not hb or not getattr(hb, "enabled", False):
+            self._hb_cfg = None
+            return
+        self._hb_cfg = _HBConfig(
+            interval=max(1, int(getattr(hb, "interval_seconds", 300) or 300)),
+            message=str(getattr(hb, "message", "") or "").strip() or "❤️ heartbeat",
+            mode=str(getattr(hb, "mode", "broadcast") or "broadcast").lower(),
+            targets=tuple(str(t) for t in (getattr(hb, "targets", []) or [])),
+            channel=int(getattr(hb, "channel", 0) or 0),
+        )
+
+    def _compile_schedules(self) -> None:
+        """
+        Normalize schedule items once and bucket them by "HH:MM".
+
+        The scheduler tick then only looks up the current minute, which is empty on
+        almost every tick. Call again if the schedule config changes.
+        """
+        sched = self.cfg.schedules
+        tz_name = getattr(sched, "timezone", "Europe/Berlin") or "Europe/Berlin"
+        try:
+            self._tz = ZoneInfo(tz_name)
+        except Exception:
+            self._tz = None
+
+        by_hhmm: Dict[str, List[_SchedItem]] = {}
+        if sched and getattr(sched, "enabled", True):
+            for it in getattr(sched, "items", []) or []:
+                t = str(getattr(it, "time", "")).strip()
+                msg = str(getattr(it, "text", "") or "").strip()
+                if not t or not msg:
+                    continue
+
+                days = [str(d).strip().lower()[:3] for d in (getattr(it, "days", []) or [])]
+                if days:
+                    day_mask = 0
+                    for i, name in enumerate(_WEEKDAYS):
+                        if name in days:
+                            day_mask |= 1 << i
+                else:
+                    day_mask = 0x7F  # daily
+
+                ch = int(getattr(it, "channel", 0))
+                dest = str(getattr(it, "destination_id", "^all") or "^all")
+                node_sel = str(getattr(it, "node", "") or "")
+                # Key that uniquely identifies this schedule item; built once per weekday.
+                key_prefix = f"{t}|{ch}|{dest}|{node_sel}|{hash(msg)}"
+                by_hhmm.setdefault(t, []).append(_SchedItem(
+                    time=t,
+                    day_mask=day_mask,
+                    channel=ch,
+                    dest=dest,
+                    node=node_sel,
+                    text=msg,
+                    keys=tuple(f"{key_prefix}|{wd}" for wd in _WEEKDAYS),
+                ))
+        self._sched_by_hhmm = by_hhmm
+
+    def _compile_commands(self) -> None:
+        """
+        Precompile command triggers, command blocks, the channel allow-list and the
+        /help text from config.
+
+        All triggers are combined into one anchored regex, one capture group per trigger,
+        in the same priority order as before: built-ins first (case-insensitive), then
+        custom triggers in config order (case-sensitive). The index of the matching group
+        maps to the command key. Call again if the command config changes.
+        """
+        alts: List[str] = []
+        keys: List[str] = []
+        cmds: List[Optional[CommandCfg]] = []
+        for b in BUILTIN_COMMANDS:
+            alts.append(f"((?i:{re.escape(b)}))")
+            keys.append(b)
+            cmds.append(None)
+        for c in self.cfg.commands.list:
+            trig = (c.trigger or "").strip()
+            if trig:
+                alts.append(f"({re.escape(trig)})")
+                # Interned: every message matching this trigger passes the same key object on.
+                keys.append(sys.intern(trig.lower()))
+                cmds.append(c)
+        self._trigger_re = re.compile("|".join(alts))
+        self._trigger_keys = keys
+        self._trigger_cmds = cmds
+
+        self._block_channels = {
+            k: frozenset(int(x) for x in v) for k, v in (self.cfg.bot.command_blocks or {}).items() if v
+        }
+        self._block_dm = frozenset(self.cfg.bot.command_blocks_dm or [])
+        self._allowed_channels = frozenset(self.cfg.bot.channels) if self.cfg.bot.channels else None
+        self._commands_enabled = bool(self.cfg.bot.commands_enabled)
+
+        self._help_text = self._build_help()
+
     def start(self) -> None:
         """
         Start the bot.
@@ -577,23 +939,33 @@ class MeshBot:
         2) Start connection threads for all configured nodes.
         3) Start the bot processing loop thread.
         4) Start the scheduler loop thread.
+        5) Start the DB writer thread (write-behind stations, names and message history).
+        6) Start the webhook thread (if a webhook URL is configured).
         """
         # Meshtastic emits receive events on these topics (varies by version)
         pub.subscribe(self._on_receive, "meshtastic.receive")
         pub.subscribe(self._on_receive, "meshtastic.receive.data")
+        pub.subscribe(self._on_connection_lost, "meshtastic.connection.lost")
 
         # Version info
         self.log.info("Version: %s by Till Vennefrohne https://github.com/mokny/meshbot", BOTVERSION)
 
         # Load plugins from disk (alphabetical order)
         self.plugins.load_all()
+        self._plugin_commands = self.plugins.has("on_command")
+        self._plugin_packet = self.plugins.has("on_packet")
+        self._plugin_text = self.plugins.has("on_text")
+        self._plugin_tick = self.plugins.has("on_tick")
 
         # Start NodeClient connection threads
         for n in self.cfg.nodes:
             c = NodeClient(n.host, n.port, n.name, self._register_interface, self._on_tx, self.log)
             self.clients[c.key] = c
             self.node_name_by_key[c.key] = n.name or c.key
+            self._clients_by_name.setdefault(self.node_name_by_key[c.key], c)
+            self._clients_by_name[c.key] = c
             threading.Thread(target=c.connect_loop, name=f"connect-{c.key}", daemon=True).start()
+            threading.Thread(target=c.tx_pump, name=f"tx-{c.key}", daemon=True).start()
 
         self.log.info("Schedules loaded: %d item(s)", len(self.cfg.schedules.items or []))
         self.log.info("Command blocks loaded: %s | DM blocks: %s",
@@ -605,11 +977,25 @@ class MeshBot:
             self.log.info("Bot-Commands disabled in config.toml. The bot will not react to any command.")
 
         # Start worker threads
-        threading.Thread(target=self._loop, name="bot-loop", daemon=True).start()
+        self._loop_thread = threading.Thread(target=self._loop, name="bot-loop", daemon=True)
+        self._loop_thread.start()
         threading.Thread(target=self._scheduler_loop, name="scheduler-loop", daemon=True).start()
+        self._db_writer = threading.Thread(target=self._db_writer_loop, name="db-writer", daemon=True)
+        self._db_writer.start()
+        if self.cfg.webhook.url:
+            self._wh_sess = requests.Session()
+            self._wh_sess.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            self._wh_sess.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            self._wh_sess.headers["User-Agent"] = "meshtastic-bot-suite/3.0"
+            threading.Thread(target=self._webhook_loop, name="webhook", daemon=True).start()
 
         # Notify plugins that the bot is running
         self.plugins.on_start()
+        self._ready.set()
+
+    def is_ready(self) -> bool:
+        """True once start() has completed (plugins loaded, clients and worker threads started)."""
+        return self._ready.is_set()
 
     def stop(self) -> None:
         """Stop threads, close DB, and close all TCP connections."""
@@ -618,19 +1004,39 @@ class MeshBot:
             self.plugins.on_stop()
         except Exception:
             pass
+        # Let the RX loop finish its current message (it queues writes and reads the DB),
+        # close the write queue, let the writer finish its batch, then persist the rest.
+        if self._loop_thread is not None:
+            self._loop_thread.join(timeout=2)
+        self._writes_closed = True
+        if self._db_writer is not None:
+            self._db_writer.join(timeout=2)
+        try:
+            self._flush_writes()
+        except Exception as e:
+            self.log.warning("DB flush on stop failed: %r", e)
         try:
             self.db.close()
         except Exception:
             pass
+        if self._wh_sess is not None:
+            self._wh_sess.close()
         for c in self.clients.values():
             c.close()
 
     # ----- mapping interface->node_key -----
 
     def _register_interface(self, iface: Any, node_key: str) -> None:
-        """Register TCPInterface -> node_key mapping."""
-        with self._iface_lock:
-            self._iface_to_key[id(iface)] = node_key
+        """
+        Register TCPInterface -> node_key mapping.
+
+        The key is stored on the interface itself, so the RX path reads it with a plain
+        attribute lookup instead of taking a lock per packet.
+        """
+        try:
+            setattr(iface, "_meshbot_node_key", node_key)
+        except Exception as e:
+            self.log.warning("Could not tag interface with node key %s: %r", node_key, e)
 
     def _node_key_for_interface(self, iface: Any) -> str:
         """
@@ -638,20 +1044,32 @@ class MeshBot:
 
         Prefer the mapping from _register_interface(); fallback to reading hostname/port from iface.
         """
-        with self._iface_lock:
-            k = self._iface_to_key.get(id(iface))
+        k = getattr(iface, "_meshbot_node_key", None)
         if k:
             return k
         host = getattr(iface, "hostname", None) or getattr(iface, "host", None) or "unknown"
         port = getattr(iface, "portNumber", None) or getattr(iface, "port", None) or 4403
         return f"{host}:{int(port)}"
 
+    def _on_connection_lost(self, interface: Any = None) -> None:
+        """Meshtastic pubsub callback: wake the NodeClient owning this interface so it reconnects."""
+        for c in self.clients.values():
+            if c.iface is not None and c.iface is interface:
+                self.log.warning("[%s] connection lost", c.key)
+                c.mark_lost()
+
     # ----- channel name -----
 
     def channel_name(self, channel_index: int) -> str:
         """Return a friendly channel name (from config) or a fallback like 'ch7'."""
-        n = (self.cfg.bot.channel_names or {}).get(int(channel_index))
-        return str(n) if n else f"ch{int(channel_index)}"
+        ci = int(channel_index)
+        name = self._channel_names.get(ci)
+        if name is None:
+            # Memoized per index: the config mapping does not change at runtime.
+            n = (self.cfg.bot.channel_names or {}).get(ci)
+            name = str(n) if n else f"ch{ci}"
+            self._channel_names[ci] = name
+        return name
 
     # ----- client selection -----
 
@@ -665,6 +1083,10 @@ class MeshBot:
         If not provided, returns the first connected client.
         """
         if node:
+            c = self._clients_by_name.get(node)
+            if c and c.connected.is_set():
+                return c
+            # Slow path: several nodes may share a name and the indexed one may be down.
             for k, name in self.node_name_by_key.items():
                 if node == name or node == k:
                     c = self.clients.get(k)
@@ -685,28 +1107,113 @@ class MeshBot:
         """
         self.tx_messages += 1
         conv_type, ch, peer = self._conversation_for_outgoing(destination_id, channel_index)
-        self.db.add_message(
-            ts=int(time.time()),
-            conversation_type=conv_type,
-            channel=ch,
-            channel_name=self.channel_name(ch or channel_index) if conv_type == "channel" else "DM",
-            peer_id=peer,
-            user_id=destination_id if destination_id else None,
-            name_short=None,
-            name_long=None,
-            node_key=node_key,
-            direction="tx",
-            message=part,
-            keep=int(self.cfg.db.keep_per_conversation),
-        )
+        self._queue_write("message", (
+            self._now_s,
+            conv_type,
+            ch,
+            self.channel_name(ch or channel_index) if conv_type == "channel" else "DM",
+            peer,
+            destination_id if destination_id else None,
+            None,
+            None,
+            node_key,
+            "tx",
+            part,
+        ))
+
+    # ----- DB writer (write-behind stations, names and message history) -----
+
+    def _queue_write(self, kind: str, args: Tuple[Any, ...]) -> None:
+        """
+        Queue a DB write for the DB writer thread (see BotDB.write_batch).
+
+        Never blocks: RX/TX callbacks must not wait on SQLite. If the writer falls
+        DB_WRITE_QUEUE_MAX writes behind, new writes are dropped. After stop() has
+        closed the queue, writes are dropped too.
+        """
+        if self._writes_closed:
+            return
+        try:
+            # Counted under the lock together with the put, so the count matches queue order.
+            with self._write_cv:
+                self._write_q.put_nowait((kind, args))
+                self._writes_queued += 1
+        except queue.Full:
+            self.log.warning("DB write queue full (%d), dropping %s write", DB_WRITE_QUEUE_MAX, kind)
+
+    def _drain_writes(self, first: Optional[Tuple[str, Tuple[Any, ...]]] = None) -> List[Tuple[str, Tuple[Any, ...]]]:
+        """Collect up to DB_WRITE_BATCH queued writes without blocking."""
+        batch: List[Tuple[str, Tuple[Any, ...]]] = [first] if first is not None else []
+        while len(batch) < DB_WRITE_BATCH:
+            try:
+                batch.append(self._write_q.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _db_writer_loop(self) -> None:
+        """
+        Apply queued DB writes to SQLite.
+
+        Waits up to 100 ms for the first write, then coalesces everything else that is
+        already queued into one transaction (BotDB.write_batch).
+        """
+        while not self._stop.is_set():
+            try:
+                first = self._write_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            batch = self._drain_writes(first)
+            try:
+                self.db.write_batch(batch, keep=int(self.cfg.db.keep_per_conversation))
+            except Exception as e:
+                self.log.warning("DB write batch of %d op(s) failed: %r", len(batch), e)
+            finally:
+                self._writes_done(len(batch))
+
+    def _writes_done(self, n: int) -> None:
+        """Mark n dequeued writes as applied (wakes up flush_writes())."""
+        with self._write_cv:
+            self._writes_applied += n
+            self._write_cv.notify_all()
+
+    def _flush_writes(self) -> None:
+        """Synchronously apply all queued DB writes (used on shutdown)."""
+        while True:
+            batch = self._drain_writes()
+            if not batch:
+                return
+            try:
+                self.db.write_batch(batch, keep=int(self.cfg.db.keep_per_conversation))
+            finally:
+                self._writes_done(len(batch))
+
+    def flush_writes(self) -> None:
+        """
+        Wait (up to DB_FLUSH_TIMEOUT_SECONDS) until every DB write queued so far has been committed.
+
+        Used before history, stats and station reads so they include messages, stations
+        and names that were just received/sent.
+        While stopping, stop() flushes the queue itself, so this returns immediately.
+        """
+        if self._db_writer is None or self._stop.is_set():
+            return
+        # Only writes queued before this call: later traffic must not extend the wait.
+        # A stalled writer (slow disk, long transaction) only makes the read slightly stale.
+        with self._write_cv:
+            target = self._writes_queued
+            done = self._write_cv.wait_for(lambda: self._writes_applied >= target, timeout=DB_FLUSH_TIMEOUT_SECONDS)
+        if not done:
+            self.log.warning("DB flush timed out after %.1fs; reading without %d pending write(s)",
+                             DB_FLUSH_TIMEOUT_SECONDS, target - self._writes_applied)
 
     # ----- conversation normalization (channel vs DM) -----
 
-    def _conversation_for_incoming(self, packet: Dict[str, Any], from_id: str, channel_index: int) -> Tuple[str, Optional[int], Optional[str]]:
+    def _conversation_for_incoming(self, view: PacketView) -> Tuple[str, Optional[int], Optional[str]]:
         """Return normalized (conversation_type, channel, peer_id) for an incoming packet."""
-        if _is_broadcast(packet):
-            return ("channel", int(channel_index), None)
-        return ("dm", None, from_id)
+        if view.is_broadcast:
+            return ("channel", view.channel, None)
+        return ("dm", None, view.from_id)
 
     def _conversation_for_outgoing(self, destination_id: str, channel_index: int) -> Tuple[str, Optional[int], Optional[str]]:
         """Return normalized (conversation_type, channel, peer_id) for an outgoing send."""
@@ -733,6 +1240,7 @@ class MeshBot:
     def get_history_channel(self, channel: int, limit: int, order: str, sort_by: str,
                             before_id: Optional[int], after_id: Optional[int], direction: Optional[str]) -> List[Dict[str, Any]]:
         """Return DB history for one channel conversation."""
+        self.flush_writes()
         return self.db.get_messages(
             conversation_type="channel",
             channel=int(channel),
@@ -748,6 +1256,7 @@ class MeshBot:
     def get_history_dm(self, peer: str, limit: int, order: str, sort_by: str,
                        before_id: Optional[int], after_id: Optional[int], direction: Optional[str]) -> List[Dict[str, Any]]:
         """Return DB history for one DM conversation."""
+        self.flush_writes()
         return self.db.get_messages(
             conversation_type="dm",
             channel=None,
@@ -781,9 +1290,10 @@ class MeshBot:
 
     def get_stats(self) -> Dict[str, Any]:
         """Return bot+DB statistics used by /stats and GET /stats."""
+        self.flush_writes()
         stations = self.db.count_stations()
         name_rows = self.db.count_name_rows()
-        uptime_s = int(time.time() - self.start_time)
+        uptime_s = int(time.monotonic() - self._start_mono)
         return {
             "db_users": stations,
             "db_name_rows": name_rows,
@@ -791,12 +1301,15 @@ class MeshBot:
             "uptime_human": self._fmt_uptime(uptime_s),
             "rx_messages": self.rx_messages,
             "tx_messages": self.tx_messages,
+            "rx_queue_depth": len(self._q),
+            "rx_dropped": self.rx_dropped,
         }
 
     def get_user_info(self, node_id: str, name_limit: int = 50, name_order: str = "desc") -> Optional[Dict[str, Any]]:
         """
         Return station info + name history for /user and GET /user/{node_id}.
         """
+        self.flush_writes()
         first_seen, last_seen, name_count = self.db.get_station_summary(node_id)
         if first_seen is None:
             return None
@@ -823,20 +1336,10 @@ class MeshBot:
         t = (text or "").strip()
         if not t:
             return None
-        low = t.lower()
-
-        builtins = ["/help", "/ping", "/user", "/stats"]
-        for b in builtins:
-            if low.startswith(b):
-                return b
-
-        # Custom commands: match by exact trigger prefix
-        for c in self.cfg.commands.list:
-            trig = (c.trigger or "").strip()
-            if trig and t.startswith(trig):
-                return trig.strip().lower()
-
-        return None
+        m = self._trigger_re.match(t) if self._trigger_re is not None else None
+        if m is None:
+            return None
+        return self._trigger_keys[m.lastindex - 1]
 
     def _is_blocked(self, cmd_key: str, channel_index: int, is_dm: bool) -> bool:
         """
@@ -850,52 +1353,119 @@ class MeshBot:
             return False
 
         # DM blocking
-        if is_dm and key in (self.cfg.bot.command_blocks_dm or []):
+        if is_dm and key in self._block_dm:
             self.log.info("Command blocked (DM): %s", key)
             return True
 
         # Channel blocking
-        blocked = (self.cfg.bot.command_blocks or {}).get(key, [])
-        if (not is_dm) and blocked and (int(channel_index) in set(int(x) for x in blocked)):
-            self.log.info("Command blocked (channel): %s in ch=%s (blocked=%s)", key, channel_index, blocked)
+        blocked = self._block_channels.get(key)
+        if (not is_dm) and blocked and int(channel_index) in blocked:
+            self.log.info("Command blocked (channel): %s in ch=%s (blocked=%s)", key, channel_index, sorted(blocked))
             return True
 
         return False
 
     # ----- webhook (config only) -----
 
-    def _post_webhook(self, packet: Dict[str, Any], node_key: str, channel_index: int, text: str) -> None:
+    def _post_webhook(self, packet: Dict[str, Any], node_key: str, channel_index: int, channel_name: str,
+                      from_id: str, text: str) -> None:
         """
-        Forward a received text message to the configured webhook URL.
+        Queue a received text message for the configured webhook URL.
 
         NOTE:
         - Webhook is configured only via config.toml. There are no chat commands.
         - Payload includes channelName for easier parsing on the receiver side.
+        - The POST itself happens on the webhook thread (_webhook_loop), so a slow
+          receiver does not hold up the bot loop.
         """
         if not self.cfg.webhook.url:
             return
 
-        host, port = (node_key.split(":") + ["4403"])[:2]
+        node = self._wh_nodes.get(node_key)
+        if node is None:
+            host, port = (node_key.split(":") + ["4403"])[:2]
+            node = {"host": host, "port": int(port), "name": self.node_name_by_key.get(node_key, node_key)}
+            self._wh_nodes[node_key] = node
+
         payload = {
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "node": {"host": host, "port": int(port), "name": self.node_name_by_key.get(node_key, node_key)},
-            "fromId": packet.get("fromId") or _derive_from_id(packet),
+            "timestamp": self._iso_now(),
+            "node": node,
+            "fromId": packet.get("fromId") or from_id,
             "toId": packet.get("toId"),
             "channel": int(channel_index),
-            "channelName": self.channel_name(int(channel_index)),
+            "channelName": channel_name,
             "text": text,
-            "raw": make_jsonable(packet),
         }
+        # make_jsonable() deep-copies the packet: skip it unless the receiver wants it.
+        if self.cfg.webhook.include_raw:
+            payload["raw"] = make_jsonable(packet)
 
         try:
-            requests.post(
-                self.cfg.webhook.url,
-                json=payload,
-                timeout=self.cfg.webhook.timeout_seconds,
-                headers={"User-Agent": "meshtastic-bot-suite/3.0"},
-            ).raise_for_status()
-        except Exception as e:
-            self.log.warning("[webhook] error: %r", e)
+            self._wh_q.put_nowait(payload)
+        except queue.Full:
+            self.log.warning("[webhook] queue full (%d), dropping message", WEBHOOK_QUEUE_MAX)
+
+    def _iso_now(self) -> str:
+        """Current UTC time as ISO-8601, formatted at most once per second."""
+        now = self._now_s
+        cached = self._ts_cache
+        if cached[0] == now:
+            return cached[1]
+        ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        self._ts_cache = (now, ts)
+        return ts
+
+    def _webhook_loop(self) -> None:
+        """
+        Webhook thread: post queued payloads using a keep-alive session.
+
+        With webhook.batch_size = 1 every payload is posted on its own (same body as before).
+        With a larger batch size, payloads are collected for up to WEBHOOK_FLUSH_SECONDS
+        (or until the batch is full) and posted together as {"events": [...]}.
+        After WEBHOOK_BREAKER_FAILURES consecutive failures, payloads are dropped for a
+        backoff window; the first successful POST afterwards resets the breaker.
+        """
+        while not self._stop.is_set():
+            try:
+                first = self._wh_q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            batch_size = self.cfg.webhook.batch_size
+            deadline = time.monotonic() + WEBHOOK_FLUSH_SECONDS
+            while len(batch) < batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._wh_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Circuit breaker: while the receiver is considered down, drop instead of
+            # waiting timeout_seconds per POST (the queue would only fill up).
+            if time.monotonic() < self._wh_skip_until:
+                continue
+
+            body = batch[0] if batch_size <= 1 else {"events": batch}
+            try:
+                self._wh_sess.post(
+                    self.cfg.webhook.url,
+                    json=body,
+                    timeout=self.cfg.webhook.timeout_seconds,
+                ).raise_for_status()
+            except Exception as e:
+                self._wh_fail_count += 1
+                self.log.warning("[webhook] error: %r", e)
+                if self._wh_fail_count >= WEBHOOK_BREAKER_FAILURES:
+                    backoff = min(WEBHOOK_BREAKER_MAX_SECONDS, 2 ** self._wh_fail_count)
+                    self._wh_skip_until = time.monotonic() + backoff
+                    self.log.warning("[webhook] %d consecutive failures, pausing webhook for %ds",
+                                     self._wh_fail_count, backoff)
+            else:
+                self._wh_fail_count = 0
+                self._wh_skip_until = 0.0
 
     # ----- receive callback -----
 
@@ -905,115 +1475,97 @@ class MeshBot:
 
         We do minimal work here:
         - normalize from_id and timestamp
-        - record station + (optional) name into DB for *all* packets
+        - queue station + (optional) name DB writes for *all* packets
         - if it's a text message, enqueue for the main bot loop
         """
         node_key = self._node_key_for_interface(interface)
-        ts = _packet_ts(packet)
-        from_id = _derive_from_id(packet)
+        view = classify_packet(packet, self._now_s, interface)
+        from_id = view.from_id
 
         # Record station + name history for ANY packet (not only text)
-        short, long = _extract_names_from_packet(packet)
-        if (not short) and (not long) and from_id:
-            s2, l2 = _extract_names_from_interface(interface, from_id, _derive_from_num(packet))
-            short = short or s2
-            long = long or l2
-
         if from_id:
-            try:
-                self.db.touch_station(from_id, ts)
-                if short is not None or long is not None:
-                    self.db.record_name(from_id, ts, short, long)
-            except Exception as e:
-                # Do not crash on DB errors; log at DEBUG.
-                self.log.debug("DB station/name record failed for %s: %r", from_id, e)
+            # Queued for the DB writer thread; the pubsub callback never waits on SQLite.
+            self._queue_write("station", (from_id, view.ts))
+            if view.short is not None or view.long is not None:
+                self._queue_write("name", (from_id, view.ts, view.short, view.long))
 
         # Plugins receive every packet (text and non-text)
-        try:
-            self.plugins.on_packet(packet, interface, node_key)
-        except Exception:
-            pass
+        if self._plugin_packet:
+            try:
+                self.plugins.on_packet(packet, interface, node_key)
+            except Exception:
+                pass
 
         # Only enqueue text packets for command processing
-        if not _is_text_packet(packet):
+        if not view.is_text:
             return
 
         if self.log.isEnabledFor(TRACE):
             self.log.trace("[%s] RX packet=%s", node_key,
-                           json.dumps(make_jsonable(packet), ensure_ascii=False, default=json_default))
+                           _TRACE_ENCODER(make_jsonable(packet)))
 
-        self._q.put(Incoming(packet=packet, node_key=node_key, iface=interface,
-                             ts=ts, from_id=from_id, short=short, long=long))
+        if len(self._q) >= RX_QUEUE_MAX:
+            self.rx_dropped += 1
+            self.log.warning("[%s] RX queue full (%d), dropping packet from %s", node_key, RX_QUEUE_MAX, from_id)
+            return
+        self._q.append(Incoming(packet=packet, view=view, node_key=node_key, iface=interface))
+        self._q_evt.set()
 
     # ----- scheduler loop -----
 
     def _scheduler_loop(self) -> None:
-        """Tick scheduler once per second."""
+        """
+        Tick scheduler once per minute.
+
+        Schedule items have minute resolution, so the thread sleeps until just after the
+        next minute boundary instead of polling every second. Waiting on the stop event
+        lets shutdown interrupt the sleep.
+        """
         self.log.info("Scheduler loop running.")
         while not self._stop.is_set():
             try:
                 self._scheduled_tick()
             except Exception as e:
                 self.log.warning("Scheduler loop error: %r", e)
-            time.sleep(1)
+            self._stop.wait(60.05 - (time.time() % 60))
 
     def _scheduled_tick(self) -> None:
         """
         Run one scheduler tick.
 
         Scheduler design:
-        - Ticks once per second.
-        - Compares current local HH:MM to each schedule item.
+        - Ticks once per minute, right after the minute boundary.
+        - Looks up the schedule items for the current local HH:MM (see _compile_schedules).
         - Uses a per-minute guard so an item fires only once per minute.
         """
-        sched = self.cfg.schedules
-        if not sched or not getattr(sched, "enabled", True):
-            return
-
-        items = getattr(sched, "items", []) or []
+        dt = datetime.datetime.now(self._tz) if self._tz else datetime.datetime.now()
+        now_hhmm = dt.strftime("%H:%M")
+        items = self._sched_by_hhmm.get(now_hhmm)
         if not items:
             return
 
-        tz_name = getattr(sched, "timezone", "Europe/Berlin") or "Europe/Berlin"
-        try:
-            tz = ZoneInfo(tz_name)
-        except Exception:
-            tz = None
-
-        import datetime as _dt
-        dt = _dt.datetime.now(tz) if tz else _dt.datetime.now()
-        weekday = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"][dt.weekday()]
-        now_hhmm = dt.strftime("%H:%M")
+        wd = dt.weekday()
         minute_bucket = int(dt.timestamp()) // 60
+        if minute_bucket != self._sched_minute:
+            self._sched_minute = minute_bucket
+            self._sched_fired.clear()
 
         for it in items:
-            t = str(getattr(it, "time", "")).strip()
-            if not t or t != now_hhmm:
-                continue
-
-            days = [str(d).strip().lower()[:3] for d in (getattr(it, "days", []) or [])]
-            if days and weekday not in days:
-                continue
-
-            ch = int(getattr(it, "channel", 0))
-            dest = str(getattr(it, "destination_id", "^all") or "^all")
-            msg = str(getattr(it, "text", "") or "").strip()
-            node_sel = str(getattr(it, "node", "") or "")
-            if not msg:
+            if not it.day_mask & (1 << wd):
                 continue
 
             # Key that uniquely identifies this schedule item in the current minute.
-            key = f"{t}|{weekday}|{ch}|{dest}|{node_sel}|{hash(msg)}"
-            if self._sched_last_sent.get(key) == minute_bucket:
+            key = it.keys[wd]
+            if key in self._sched_fired:
                 continue
 
-            client = self.get_client(node_sel or None)
+            client = self.get_client(it.node or None)
             if not client:
                 continue
 
-            client.send_text(msg, destination_id=dest, channel_index=ch)
-            self._sched_last_sent[key] = minute_bucket
-            self.log.info("Scheduled message sent: time=%s ch=%s dest=%s", t, ch, dest)
+            client.send_text(it.text, destination_id=it.dest, channel_index=it.channel)
+            self._sched_fired.add(key)
+            self.log.info("Scheduled message sent: time=%s ch=%s dest=%s", it.time, it.channel, it.dest)
 
     # ----- heartbeat -----
 
@@ -1026,34 +1578,26 @@ class MeshBot:
         - mode='broadcast': send to ^all on heartbeat.channel
         - mode='dm': send DMs to heartbeat.targets
         """
-        hb = self.cfg.heartbeat
-        if not hb or not getattr(hb, "enabled", False):
+        hb = self._hb_cfg
+        if hb is None:
             return
 
-        interval = int(getattr(hb, "interval_seconds", 300) or 300)
-        if interval < 1:
-            interval = 1
-
-        if (time.time() - self._last_hb) < interval:
+        # Monotonic clock: wall-clock steps (NTP, manual changes) must not skip or repeat heartbeats.
+        now = time.monotonic()
+        if self._last_hb is not None and (now - self._last_hb) < hb.interval:
             return
 
-        msg = str(getattr(hb, "message", "") or "").strip() or "❤️ heartbeat"
-        mode = str(getattr(hb, "mode", "broadcast") or "broadcast").lower()
-        targets = list(getattr(hb, "targets", []) or [])
-        hb_channel = int(getattr(hb, "channel", 0) or 0)
-
         for client in self.clients.values():
             if not client.connected.is_set():
                 continue
 
-            if mode == "dm" and targets:
-                for t in targets:
-                    client.send_text(msg, destination_id=str(t), channel_index=0)
+            if hb.mode == "dm" and hb.targets:
+                for t in hb.targets:
+                    client.send_text(hb.message, destination_id=t, channel_index=0)
             else:
-                client.send_text(msg, destination_id="^all", channel_index=hb_channel)
-
-        self._last_hb = time.time()
+                client.send_text(hb.message, destination_id="^all", channel_index=hb.channel)
 
+        self._last_hb = now
 
     def send_reply(self, text: str, destination_id: str, channel_index: int, node_hint: Optional[str] = None) -> bool:
         """Send a reply using the standard message-splitting rules.
@@ -1074,6 +1618,10 @@ class MeshBot:
     # ----- help & custom commands -----
 
     def _make_help(self) -> str:
+        """Return /help output (built by _compile_commands)."""
+        return self._help_text
+
+    def _build_help(self) -> str:
         """Generate /help output."""
         lines = [
             "⚠️ Help (v"+BOTVERSION+")",
@@ -1094,17 +1642,76 @@ class MeshBot:
         Response supports simple .format() placeholders:
             {text}, {fromId}, {channel}, {channelName}, {node}
         """
-        for c in self.cfg.commands.list:
-            trig = c.trigger.strip()
-            if trig and text.startswith(trig):
-                return c.response.format(
-                    text=text,
-                    fromId=from_id,
-                    channel=channel_index,
-                    channelName=self.channel_name(channel_index),
-                    node=self.node_name_by_key.get(node_key, node_key),
+        # Same precompiled matcher as _matched_command_key(); built-in groups map to None.
+        m = self._trigger_re.match(text) if self._trigger_re is not None else None
+        c = self._trigger_cmds[m.lastindex - 1] if m is not None else None
+        if c is None:
+            return None
+        return c.response.format(
+            text=text,
+            fromId=from_id,
+            channel=channel_index,
+            channelName=self.channel_name(channel_index),
+            node=self.node_name_by_key.get(node_key, node_key),
+        )
+
+    # ----- built-in commands -----
+
+    def _h_help(self, text: str, inc: Incoming, client: NodeClient, dest: str, channel_index: int) -> None:
+        """/help: list built-in and custom commands."""
+        client.send_text(self._make_help(), destination_id=dest, channel_index=channel_index)
+
+    def _h_ping(self, text: str, inc: Incoming, client: NodeClient, dest: str, channel_index: int) -> None:
+        """/ping: reply with the sender's short name, hop count and transport."""
+        from_id = inc.view.from_id
+        # Resolve short name (packet -> interface.nodes -> DB fallback)
+        short = (inc.view.short or "").strip()
+        if not short and from_id:
+            self.flush_writes()
+            s_db, _ = self.db.get_latest_name(from_id)
+            short = (s_db or "").strip()
+        if not short:
+            short = from_id or "unknown"
+
+        reply = f"Pong {short} | hops={_hops(inc.packet)} | via={_via(inc.packet)}"
+        client.send_text(reply, destination_id=dest, channel_index=channel_index)
+
+    def _h_stats(self, text: str, inc: Incoming, client: NodeClient, dest: str, channel_index: int) -> None:
+        """/stats: uptime, DB and message counters."""
+        s = self.get_stats()
+        out = "\n".join([
+            f"Uptime: {s.get('uptime_human')}",
+            f"DB users: {s.get('db_users', 0)} (name rows: {s.get('db_name_rows', 0)})",
+            f"RX msgs: {s.get('rx_messages', 0)} | TX msgs: {s.get('tx_messages', 0)}",
+        ])
+        client.send_text(out, destination_id=dest, channel_index=channel_index)
+
+    def _h_user(self, text: str, inc: Incoming, client: NodeClient, dest: str, channel_index: int) -> None:
+        """/user [<!id>]: station info and name history (sender if no argument)."""
+        parts = text.split()
+        target = parts[1].strip() if len(parts) >= 2 else inc.view.from_id
+
+        info = self.get_user_info(target, name_limit=20, name_order="desc")
+        if not info:
+            client.send_text(f"No data for {target}", destination_id=dest, channel_index=channel_index)
+            return
+
+        hist = info.get("name_history", [])
+        lines = [
+            f"ID: {target}",
+            f"First: {_fmt_utc(int(info['first_seen']))}",
+            f"Names: {max(0, int(info.get('name_entries', 0)))}",
+            "History:",
+        ]
+        if not hist:
+            lines.append("- (no names recorded yet)")
+        else:
+            for h in hist:
+                lines.append(
+                    f"- {_fmt_utc(int(h['seen_at']))} | ({h.get('short') or '-'}) {h.get('long') or '-'}"
                 )
-        return None
+
+        client.send_text("\n".join(lines), destination_id=dest, channel_index=channel_index)
 
     # ----- main bot loop -----
 
@@ -1125,6 +1732,8 @@ class MeshBot:
             raise RuntimeError("MeshBot is missing _loop(); rebuild the image without cache or ensure /app/app/bot.py is updated")
 
         while not self._stop.is_set():
+            self._now_s = int(time.time())
+
             # Heartbeat tick is quick; errors are ignored
             try:
                 self._heartbeat_tick()
@@ -1132,176 +1741,142 @@ class MeshBot:
                 pass
 
             # Plugins periodic hook
-            try:
-                self.plugins.on_tick(int(time.time()))
-            except Exception:
-                pass
+            if self._plugin_tick:
+                try:
+                    self.plugins.on_tick(self._now_s)
+                except Exception:
+                    pass
 
-            # Wait for next incoming message (timeout so loop can exit)
-            try:
-                inc = self._q.get(timeout=0.5)
-            except queue.Empty:
+            # Wait for incoming messages (timeout so loop can exit), then drain a batch.
+            # Always check the deque before waiting, so a set() between the check and the
+            # clear() cannot strand a message.
+            if not self._q:
+                self._q_evt.wait(0.5)
+                self._q_evt.clear()
                 continue
 
-            packet = inc.packet
-            node_key = inc.node_key
-            text = _get_text(packet)
-            if not text:
-                continue
+            # Heartbeat and plugin ticks run once per batch; the cap keeps them running
+            # even while messages arrive faster than they are processed.
+            for _ in range(RX_BATCH_MAX):
+                if self._stop.is_set():
+                    break
+                try:
+                    inc = self._q.popleft()
+                except IndexError:
+                    break
+                try:
+                    self._process_incoming(inc)
+                except Exception as e:
+                    self.log.warning("Error processing message: %r", e)
+
+    def _process_incoming(self, inc: Incoming) -> None:
+        """Handle one dequeued text message (history, webhook, plugins, commands)."""
+        packet = inc.packet
+        view = inc.view
+        node_key = inc.node_key
+        text = view.text
+        if not text:
+            return
 
-            channel_index = _channel_index(packet)
-            from_id = inc.from_id
-            is_dm = not _is_broadcast(packet)
-
-            self.rx_messages += 1
-
-            # Persist RX message (for history API) for both channel and DM conversations
-            conv_type, ch, peer = self._conversation_for_incoming(packet, from_id, channel_index)
-            self.db.add_message(
-                ts=int(inc.ts),
-                conversation_type=conv_type,
-                channel=ch,
-                channel_name=self.channel_name(ch or channel_index) if conv_type == "channel" else "DM",
-                peer_id=peer,
-                user_id=from_id or None,
-                name_short=inc.short,
-                name_long=inc.long,
+        channel_index = view.channel
+        from_id = view.from_id
+        is_dm = not view.is_broadcast
+        reply_dest = from_id if is_dm else "^all"
+        ch_name = self.channel_name(channel_index)
+
+        self.rx_messages += 1
+
+        # Persist RX message (for history API) for both channel and DM conversations
+        conv_type, ch, peer = self._conversation_for_incoming(view)
+        self._queue_write("message", (
+            int(view.ts),
+            conv_type,
+            ch,
+            ch_name if conv_type == "channel" else "DM",
+            peer,
+            from_id or None,
+            view.short,
+            view.long,
+            node_key,
+            "rx",
+            text,
+        ))
+
+        self.log.debug("[%s] RX from=%s ch=%s text=%r", node_key, from_id, channel_index, text)
+
+        # Forward to webhook (if configured)
+        self._post_webhook(packet, node_key, channel_index, ch_name, from_id, text)
+
+        # Plugin meta is built once and shared by on_text and on_command (only if a plugin uses it).
+        # Immutable (NamedTuple), so one plugin cannot change what the next callback sees.
+        meta: Optional[Meta] = None
+        if self._plugin_text or self._plugin_commands:
+            meta = Meta(
+                from_id=from_id,
+                channel=channel_index,
+                channel_name=ch_name,
+                is_dm=is_dm,
                 node_key=node_key,
-                direction="rx",
-                message=text,
-                keep=int(self.cfg.db.keep_per_conversation),
+                short=view.short,
+                long=view.long,
+                packet=packet,
+                reply_dest=reply_dest,
             )
 
-            self.log.debug("[%s] RX from=%s ch=%s text=%r", node_key, from_id, channel_index, text)
+        # Plugins receive text events (after DB + webhook)
+        if self._plugin_text:
+            try:
+                self.plugins.on_text(text, meta)
+            except Exception:
+                pass
+
+        # Nothing below can react when built-in/custom commands are disabled and no plugin
+        # handles commands: skip command matching and blocking entirely.
+        if not self._commands_enabled and not self._plugin_commands:
+            return
+
+        # If bot.channels is configured, only react to commands in those channels.
+        # DMs are always allowed.
+        if (not is_dm) and self._allowed_channels is not None and (channel_index not in self._allowed_channels):
+            return
 
-            # Forward to webhook (if configured)
-            self._post_webhook(packet, node_key, channel_index, text)
+        # Detect command key (built-in or custom)
+        cmd_key = self._matched_command_key(text)
 
-            # Plugins receive text events (after DB + webhook)
+        # Apply command blocking rules
+        if cmd_key and self._is_blocked(cmd_key, channel_index, is_dm):
+            return
+        # Plugins can handle commands before the bot.
+        if cmd_key and self._plugin_commands:
             try:
-                self.plugins.on_text(text, {
-                    "from_id": from_id,
-                    "channel": channel_index,
-                    "channel_name": self.channel_name(channel_index),
-                    "is_dm": is_dm,
-                    "node_key": node_key,
-                    "short": inc.short,
-                    "long": inc.long,
-                    "packet": packet,
-                    "reply_dest": _reply_dest(packet, from_id),
-                })
+                if self.plugins.on_command(cmd_key, text, meta):
+                    return
             except Exception:
                 pass
 
-            # If bot.channels is configured, only react to commands in those channels.
-            # DMs are always allowed.
-            if (not is_dm) and self.cfg.bot.channels and (channel_index not in set(self.cfg.bot.channels)):
-                continue
-
-            # Detect command key (built-in or custom)
-            cmd_key = self._matched_command_key(text)
 
-            # Apply command blocking rules
-            if cmd_key and self._is_blocked(cmd_key, channel_index, is_dm):
-                continue
-            # Plugins can handle commands before the bot.
-            if cmd_key:
-                meta = {
-                    "from_id": from_id,
-                    "channel": channel_index,
-                    "channel_name": self.channel_name(channel_index),
-                    "is_dm": is_dm,
-                    "node_key": node_key,
-                    "short": inc.short,
-                    "long": inc.long,
-                    "packet": packet,
-                    "reply_dest": _reply_dest(packet, from_id),
-                }
-                try:
-                    if self.plugins.on_command(cmd_key, text, meta):
-                        continue
-                except Exception:
-                    pass
+        # Strict mode: ignore all non-commands
+        if self.cfg.bot.strict and (cmd_key is None):
+            return
 
+        # Choose the node connection that received the message (fallback to any connected client)
+        client = self.clients.get(node_key) or self.get_client(None)
+        if not client:
+            return
 
-            # Strict mode: ignore all non-commands
-            if self.cfg.bot.strict and (cmd_key is None):
-                continue
+        # Reply destination: '^all' if channel message, else from_id for DMs
+        dest = reply_dest
 
-            # Choose the node connection that received the message (fallback to any connected client)
-            client = self.clients.get(node_key) or self.get_client(None)
-            if not client:
-                continue
+        if self._commands_enabled and cmd_key is not None:
+            # ----- built-in commands -----
+            # cmd_key comes from the precompiled trigger regex (built-ins match first).
+            handler = self._builtin_handlers.get(cmd_key)
+            if handler is not None:
+                handler(text, inc, client, dest, channel_index)
+                return
 
-            # Reply destination: '^all' if channel message, else from_id for DMs
-            dest = _reply_dest(packet, from_id)
+            # ----- custom commands -----
 
-            lower = text.lower()
-            
-            if self.cfg.bot.commands_enabled:
-                # ----- built-in commands -----
-    
-                if lower.startswith("/help"):
-                    client.send_text(self._make_help(), destination_id=dest, channel_index=channel_index)
-                    continue
-    
-                if lower.startswith("/ping"):
-                    # Resolve short name (packet -> interface.nodes -> DB fallback)
-                    short = (inc.short or "").strip()
-                    if not short and from_id:
-                        s_db, _ = self.db.get_latest_name(from_id)
-                        short = (s_db or "").strip()
-                    if not short:
-                        short = from_id or "unknown"
-    
-                    reply = f"Pong {short} | hops={_hops(packet)} | via={_via(packet)}"
-                    client.send_text(reply, destination_id=dest, channel_index=channel_index)
-                    continue
-    
-                if lower.startswith("/stats"):
-                    s = self.get_stats()
-                    out = "\n".join([
-                        f"Uptime: {s.get('uptime_human')}",
-                        f"DB users: {s.get('db_users', 0)} (name rows: {s.get('db_name_rows', 0)})",
-                        f"RX msgs: {s.get('rx_messages', 0)} | TX msgs: {s.get('tx_messages', 0)}",
-                    ])
-                    client.send_text(out, destination_id=dest, channel_index=channel_index)
-                    continue
-    
-                if lower.startswith("/user"):
-                    # /user with no arg -> show info about sender
-                    parts = text.split()
-                    target = parts[1].strip() if len(parts) >= 2 else from_id
-    
-                    info = self.get_user_info(target, name_limit=20, name_order="desc")
-                    if not info:
-                        client.send_text(f"No data for {target}", destination_id=dest, channel_index=channel_index)
-                        continue
-    
-                    def fmt_ts(tsv: int) -> str:
-                        # We intentionally use UTC in responses for consistent interpretation.
-                        return time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(int(tsv)))
-    
-                    hist = info.get("name_history", [])
-                    lines = [
-                        f"ID: {target}",
-                        f"First: {fmt_ts(info['first_seen'])}",
-                        f"Names: {max(0, int(info.get('name_entries', 0)))}",
-                        "History:",
-                    ]
-                    if not hist:
-                        lines.append("- (no names recorded yet)")
-                    else:
-                        for h in hist:
-                            lines.append(
-                                f"- {fmt_ts(h['seen_at'])} | ({h.get('short') or '-'}) {h.get('long') or '-'}"
-                            )
-    
-                    client.send_text("\n".join(lines), destination_id=dest, channel_index=channel_index)
-                    continue
-    
-                # ----- custom commands -----
-    
-                resp = self._handle_custom_command(text, from_id, channel_index, node_key)
-                if resp:
-                    client.send_text(resp, destination_id=dest, channel_index=channel_index)
+            resp = self._handle_custom_command(text, from_id, channel_index, node_key)
+            if resp:
+                client.send_text(resp, destination_id=dest, channel_index=channel_index)
@@ -32,8 +32,9 @@ Important sections in config.toml
 
 from __future__ import annotations
 
+import copy
 import pathlib
-import re
+import threading
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -84,6 +85,9 @@ def _str_list(v: Any) -> List[str]:
     if not v:
         return []
     if isinstance(v, list):
+        # Fast path: already a list of clean, non-empty strings (e.g. a saved config).
+        if all(type(x) is str and x and not x[0].isspace() and not x[-1].isspace() for x in v):
+            return v[:]
         out: List[str] = []
         for x in v:
             if x is None:
@@ -100,6 +104,13 @@ def _int_str_dict(v: Any) -> Dict[int, str]:
     out: Dict[int, str] = {}
     if not v or not isinstance(v, dict):
         return out
+    # Fast path: TOML table keys are strs; plain decimal keys parse the same with int().
+    # Keys with a leading zero ("07") are left to the loop, where int(k, 0) rejects them.
+    if all(
+        type(k) is str and k.isdecimal() and (len(k) == 1 or k[0] != "0") and type(val) is str
+        for k, val in v.items()
+    ):
+        return {int(k): val for k, val in v.items()}
     for k, val in v.items():
         try:
             ki = int(str(k), 0)
@@ -111,7 +122,26 @@ def _int_str_dict(v: Any) -> Dict[int, str]:
 
 # ---------- helpers for channel lists and command blocking ----------
 
-def _resolve_channels(raw_list: Any, channel_names: Dict[int, str]) -> List[int]:
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+def _is_num_token(s: str) -> bool:
+    """
+    Return True for numeric channel tokens: decimal ("7") or 0x-prefixed hex ("0x07").
+
+    Plain string checks; tokens are short, so this is cheaper than a regex match.
+    """
+    if s.isdecimal():
+        return True
+    return len(s) > 2 and s[:2] == "0x" and all(c in _HEX_DIGITS for c in s[2:])
+
+
+def _channel_name_index(channel_names: Dict[int, str]) -> Dict[str, int]:
+    """Build the inverse {lowercased channel name: index} lookup for channel_names."""
+    return {str(v).strip().lower(): int(k) for k, v in (channel_names or {}).items()}
+
+
+def _resolve_channels(raw_list: Any, channel_names: Dict[int, str], inv: Optional[Dict[str, int]] = None) -> List[int]:
     """
     Resolve a mixed list of channel indices and channel names into indices.
 
@@ -119,10 +149,13 @@ def _resolve_channels(raw_list: Any, channel_names: Dict[int, str]) -> List[int]
         channel_names = {7: "Trusted"}
         raw_list = [7, "Trusted"]
         -> [7]
+
+    'inv' is an optional prebuilt _channel_name_index(channel_names).
     """
     if not raw_list or not isinstance(raw_list, list):
         return []
-    inv: Dict[str, int] = {str(v).strip().lower(): int(k) for k, v in (channel_names or {}).items()}
+    if inv is None:
+        inv = _channel_name_index(channel_names)
     out: List[int] = []
     for x in raw_list:
         if isinstance(x, (int, float)):
@@ -133,7 +166,7 @@ def _resolve_channels(raw_list: Any, channel_names: Dict[int, str]) -> List[int]
             if not s:
                 continue
             # numeric string?
-            if re.fullmatch(r"0x[0-9a-fA-F]+|\d+", s):
+            if _is_num_token(s):
                 try:
                     out.append(int(s, 0))
                 except Exception:
@@ -143,16 +176,12 @@ def _resolve_channels(raw_list: Any, channel_names: Dict[int, str]) -> List[int]
                 if idx is not None:
                     out.append(int(idx))
     # de-dup preserve order
-    seen = set()
-    dedup: List[int] = []
-    for n in out:
-        if n not in seen:
-            seen.add(n)
-            dedup.append(n)
-    return dedup
+    return list(dict.fromkeys(out))
 
 
-def _parse_command_blocks(raw_blocks: Any, channel_names: Dict[int, str]) -> Tuple[Dict[str, List[int]], List[str]]:
+def _parse_command_blocks(
+    raw_blocks: Any, channel_names: Dict[int, str], inv: Optional[Dict[str, int]] = None
+) -> Tuple[Dict[str, List[int]], List[str]]:
     """
     Parse [bot.command_blocks] allowing:
 
@@ -160,6 +189,8 @@ def _parse_command_blocks(raw_blocks: Any, channel_names: Dict[int, str]) -> Tup
     - channel names (strings matching bot.channel_names values)
     - the string "dm" to block the command in DMs
 
+    'inv' is an optional prebuilt _channel_name_index(channel_names).
+
     Returns:
       (channel_blocks, dm_blocks)
     """
@@ -168,7 +199,8 @@ def _parse_command_blocks(raw_blocks: Any, channel_names: Dict[int, str]) -> Tup
     if not raw_blocks or not isinstance(raw_blocks, dict):
         return blocks, dm_blocks
 
-    inv: Dict[str, int] = {str(v).strip().lower(): int(k) for k, v in (channel_names or {}).items()}
+    if inv is None:
+        inv = _channel_name_index(channel_names)
 
     for cmd, v in raw_blocks.items():
         key = str(cmd).strip().lower()
@@ -185,7 +217,7 @@ def _parse_command_blocks(raw_blocks: Any, channel_names: Dict[int, str]) -> Tup
                         if key not in dm_blocks:
                             dm_blocks.append(key)
                         continue
-                    if re.fullmatch(r"0x[0-9a-fA-F]+|\d+", s):
+                    if _is_num_token(s):
                         try:
                             chs.append(int(s, 0))
                         except Exception:
@@ -197,22 +229,16 @@ def _parse_command_blocks(raw_blocks: Any, channel_names: Dict[int, str]) -> Tup
                 elif isinstance(x, (int, float)):
                     chs.append(int(x))
 
-        # de-dup
-        seen = set()
-        dedup: List[int] = []
-        for n in chs:
-            if n not in seen:
-                seen.add(n)
-                dedup.append(n)
-        if dedup:
-            blocks[key] = dedup
+        # de-dup preserve order
+        if chs:
+            blocks[key] = list(dict.fromkeys(chs))
 
     return blocks, dm_blocks
 
 
 # ---------- config dataclasses (typed config model) ----------
 
-@dataclass
+@dataclass(slots=True)
 class NodeCfg:
     """One Meshtastic node reachable via WiFi TCP (hostname:portNumber)."""
     host: str
@@ -220,14 +246,19 @@ class NodeCfg:
     name: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class WebhookCfg:
     """Webhook forwarding settings (config only)."""
     url: str = ""
     timeout_seconds: int = 5
+    # Max messages per POST. 1 = one payload object per message;
+    # >1 = messages are collected for up to ~1s and posted as {"events": [...]}.
+    batch_size: int = 1
+    # Include the full Meshtastic packet as "raw" in each payload
+    include_raw: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class HeartbeatCfg:
     """
     Heartbeat settings.
@@ -246,7 +277,7 @@ class HeartbeatCfg:
     channel: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class ScheduleItemCfg:
     """One scheduled message item (fixed HH:MM, optional weekdays)."""
     time: str  # HH:MM
@@ -257,7 +288,7 @@ class ScheduleItemCfg:
     node: str = ""  # optional node selector (name or host:port)
 
 
-@dataclass
+@dataclass(slots=True)
 class SchedulesCfg:
     """Scheduler settings."""
     enabled: bool = True
@@ -265,13 +296,13 @@ class SchedulesCfg:
     items: List[ScheduleItemCfg] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggingCfg:
     """Logging settings. TRACE is the most verbose level."""
     level: str = "INFO"  # ERROR|WARNING|INFO|DEBUG|TRACE
 
 
-@dataclass
+@dataclass(slots=True)
 class ApiCfg:
     """HTTP API settings."""
     listen_host: str = "0.0.0.0"
@@ -279,13 +310,13 @@ class ApiCfg:
     tokens: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginsCfg:
     """Plugin loader settings."""
     enabled: bool = True
     path: str = "/plugins"
 
-@dataclass
+@dataclass(slots=True)
 class DbCfg:
 
     """SQLite DB settings."""
@@ -293,20 +324,20 @@ class DbCfg:
     keep_per_conversation: int = 10000
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandCfg:
     """One custom command: trigger -> response template."""
     trigger: str
     response: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandsCfg:
     """Container for custom command list."""
     list: List[CommandCfg] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class BotCfg:
     """Bot settings: naming, channel allow-lists, and command blocking."""
     name: str = "meshbot"
@@ -322,7 +353,7 @@ class BotCfg:
     command_blocks_dm: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class AppCfg:
     """Full app config."""
     nodes: List[NodeCfg] = field(default_factory=list)
@@ -339,16 +370,47 @@ class AppCfg:
 
 # ---------- load/save functions ----------
 
+# Parsed configs per path: path -> ((st_mtime_ns, st_size), AppCfg).
+# load_config() only re-parses the TOML file when it changed on disk.
+_CFG_CACHE: Dict[str, Tuple[Tuple[int, int], AppCfg]] = {}
+_CFG_CACHE_LOCK = threading.Lock()
+
+
 def load_config(path: str) -> AppCfg:
     """
     Load TOML config from path.
 
     If the file does not exist, returns a config with default values.
+    Results are cached by file mtime+size; every call returns its own copy,
+    so callers may modify it freely.
     """
     p = pathlib.Path(path)
+    try:
+        st = p.stat()
+        stamp: Optional[Tuple[int, int]] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+
+    if stamp is not None:
+        with _CFG_CACHE_LOCK:
+            hit = _CFG_CACHE.get(path)
+        if hit is not None and hit[0] == stamp:
+            return copy.deepcopy(hit[1])
+
+    cfg = _parse_config(p)
+    if stamp is not None:
+        with _CFG_CACHE_LOCK:
+            _CFG_CACHE[path] = (stamp, copy.deepcopy(cfg))
+    return cfg
+
+
+def _parse_config(p: pathlib.Path) -> AppCfg:
+    """Parse the TOML file at p into an AppCfg (see load_config)."""
     raw: Dict[str, Any] = {}
     if p.exists():
-        raw = tomllib.loads(p.read_text(encoding="utf-8"))
+        # tomllib reads binary files itself (TOML is always UTF-8)
+        with p.open("rb") as f:
+            raw = tomllib.load(f)
 
     # nodes
     nodes_container: Any = raw.get("nodes", {}) or {}
@@ -366,10 +428,11 @@ def load_config(path: str) -> AppCfg:
     # bot
     bot_raw = raw.get("bot", {}) or {}
     channel_names = _int_str_dict(bot_raw.get("channel_names"))
-    blocks_map, dm_blocks = _parse_command_blocks(bot_raw.get("command_blocks"), channel_names)
+    channel_inv = _channel_name_index(channel_names)
+    blocks_map, dm_blocks = _parse_command_blocks(bot_raw.get("command_blocks"), channel_names, channel_inv)
     bot = BotCfg(
         name=_as_str(bot_raw.get("name"), "meshbot"),
-        channels=_resolve_channels(bot_raw.get("channels"), channel_names),
+        channels=_resolve_channels(bot_raw.get("channels"), channel_names, channel_inv),
         channel_names=channel_names,
         strict=_bool(bot_raw.get("strict"), False),
         commands_enabled=_bool(bot_raw.get("commands_enabled"), False),
@@ -382,6 +445,8 @@ def load_config(path: str) -> AppCfg:
     webhook = WebhookCfg(
         url=_as_str(webhook_raw.get("url"), ""),
         timeout_seconds=_int(webhook_raw.get("timeout_seconds"), 5),
+        batch_size=max(1, _int(webhook_raw.get("batch_size"), 1)),
+        include_raw=_bool(webhook_raw.get("include_raw"), True),
     )
 
     # heartbeat (default off)
@@ -397,30 +462,26 @@ def load_config(path: str) -> AppCfg:
 
     # schedules
     sch_raw = raw.get("schedules", {}) or {}
+    items_raw = sch_raw.get("items", []) if isinstance(sch_raw, dict) else []
     schedules = SchedulesCfg(
         enabled=_bool(sch_raw.get("enabled"), True) if isinstance(sch_raw, dict) else True,
         timezone=_as_str(sch_raw.get("timezone"), "Europe/Berlin") if isinstance(sch_raw, dict) else "Europe/Berlin",
-        items=[],
-    )
-    items_raw = sch_raw.get("items", []) if isinstance(sch_raw, dict) else []
-    if isinstance(items_raw, list):
-        for it in items_raw:
-            if not isinstance(it, dict):
-                continue
-            t = _as_str(it.get("time")).strip()
-            msg = _as_str(it.get("text")).strip()
-            if not t or not msg:
-                continue
-            schedules.items.append(
-                ScheduleItemCfg(
-                    time=t,
-                    channel=_int(it.get("channel"), 0),
-                    destination_id=_as_str(it.get("destination_id"), "^all"),
-                    text=msg,
-                    days=[d.strip().lower()[:3] for d in _str_list(it.get("days"))],
-                    node=_as_str(it.get("node"), ""),
-                )
+        # Items without time or text are skipped.
+        items=[
+            ScheduleItemCfg(
+                time=t,
+                channel=_int(it.get("channel"), 0),
+                destination_id=_as_str(it.get("destination_id"), "^all"),
+                text=msg,
+                days=[d.strip().lower()[:3] for d in _str_list(it.get("days"))],
+                node=_as_str(it.get("node"), ""),
             )
+            for it in (items_raw if isinstance(items_raw, list) else ())
+            if isinstance(it, dict)
+            and (t := _as_str(it.get("time")).strip())
+            and (msg := _as_str(it.get("text")).strip())
+        ],
+    )
 
     # logging
     log_raw = raw.get("logging", {}) or {}
@@ -451,15 +512,14 @@ def load_config(path: str) -> AppCfg:
     # custom commands
     commands_raw = raw.get("commands", {}) or {}
     cmd_list_raw = commands_raw.get("list", []) if isinstance(commands_raw, dict) else []
-    cmd_list: List[CommandCfg] = []
-    if isinstance(cmd_list_raw, list):
-        for c in cmd_list_raw:
-            if not isinstance(c, dict):
-                continue
-            trig = _as_str(c.get("trigger")).strip()
-            resp = _as_str(c.get("response"))
-            if trig and resp:
-                cmd_list.append(CommandCfg(trigger=trig, response=resp))
+    # Commands need both a trigger and a response.
+    cmd_list = [
+        CommandCfg(trigger=trig, response=resp)
+        for c in (cmd_list_raw if isinstance(cmd_list_raw, list) else ())
+        if isinstance(c, dict)
+        and (trig := _as_str(c.get("trigger")).strip())
+        and (resp := _as_str(c.get("response")))
+    ]
     commands = CommandsCfg(list=cmd_list)
 
     return AppCfg(
@@ -484,17 +544,31 @@ def save_config(path: str, cfg: AppCfg) -> None:
     """
     p = pathlib.Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(config_to_toml(cfg), encoding="utf-8")
+
+
+def config_to_toml(cfg: AppCfg) -> str:
+    """Serialize a config to TOML text (the format save_config() writes)."""
+    # TOML table keys must be strings; only copy channel_names if some key is not one already.
+    channel_names = cfg.bot.channel_names or {}
+    if not all(type(k) is str for k in channel_names):
+        channel_names = {str(k): v for k, v in channel_names.items()}
     data: Dict[str, Any] = {
         "nodes": {"list": [{"host": n.host, "port": n.port, "name": n.name} for n in cfg.nodes]},
         "bot": {
             "name": cfg.bot.name,
             "channels": cfg.bot.channels,
-            "channel_names": {str(k): v for k, v in (cfg.bot.channel_names or {}).items()},
+            "channel_names": channel_names,
             "strict": cfg.bot.strict,
             "commands_enabled": cfg.bot.commands_enabled,
-            "command_blocks": {k: v for k, v in (cfg.bot.command_blocks or {}).items()},
+            "command_blocks": cfg.bot.command_blocks or {},
+        },
+        "webhook": {
+            "url": cfg.webhook.url,
+            "timeout_seconds": cfg.webhook.timeout_seconds,
+            "batch_size": cfg.webhook.batch_size,
+            "include_raw": cfg.webhook.include_raw,
         },
-        "webhook": {"url": cfg.webhook.url, "timeout_seconds": cfg.webhook.timeout_seconds},
         "heartbeat": {
             "enabled": cfg.heartbeat.enabled,
             "interval_seconds": cfg.heartbeat.interval_seconds,
@@ -516,4 +590,4 @@ def save_config(path: str, cfg: AppCfg) -> None:
         "db": {"path": cfg.db.path, "keep_per_conversation": cfg.db.keep_per_conversation},
         "commands": {"list": [{"trigger": c.trigger, "response": c.response} for c in cfg.commands.list]},
     }
-    p.write_text(tomli_w.dumps(data), encoding="utf-8")
+    return tomli_w.dumps(data)
@@ -13,17 +13,72 @@ messages
 
 Thread safety
 -------------
-The bot loop thread and the API thread both access the database.
+The bot threads and the API threads all access the database.
 SQLite itself is not fully thread-safe without care, so we use:
-- check_same_thread=False (allow use from multiple threads)
-- a single connection with a global lock (threading.Lock)
+- one connection per thread (threading.local), opened on first use
+- a writer lock (threading.Lock) so only one thread writes at a time
+
+The DB runs in WAL mode with synchronous=NORMAL, so commits do not fsync the main
+database file, and readers run concurrently without being blocked by the writer.
 """
 
 from __future__ import annotations
 
 import sqlite3
 import threading
-from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Column order matches the "message" rows accepted by BotDB.write_batch(), plus conv_key.
+_INSERT_MESSAGE_SQL = """INSERT INTO messages(ts, conversation_type, channel, channel_name, peer_id, user_id,
+                                          name_short, name_long, node_key, direction, message, conv_key)
+                         VALUES(?,?,?,?,?,?,?,?,?,?,?,?)"""
+
+
+# Static message-history queries, keyed by (sort_by, order); see BotDB.get_messages().
+# Optional filters are bound as NULL instead of changing the SQL text, so every
+# variant maps to exactly one prepared statement in the connection's cache.
+# Paging is keyset-only (before_id/after_id, never OFFSET) and every variant reads rows
+# straight from an index in ORDER BY order, so there is no sort step:
+# - sort_by=id: range seek on idx_msg_ck_id(conv_key, id DESC); the id bounds use
+#   COALESCE over the bind, so they stay plain range predicates.
+# - sort_by=ts: walks idx_msg_ck_ts_id(conv_key, ts, id); "+id" keeps the planner from
+#   choosing the id range (which would need a temp b-tree to sort by ts).
+_MESSAGES_WHERE = """SELECT id, ts, conversation_type, channel, channel_name, peer_id, user_id, name_short, name_long,
+                            node_key, direction, message
+                     FROM messages
+                     WHERE conv_key=? AND
+                           (? IS NULL OR direction = ?) AND
+                           {id} < COALESCE(?, 9223372036854775807) AND
+                           {id} > COALESCE(?, -1)
+                  """
+_MESSAGES_SQL = {
+    # Stable ordering: if sorting by ts, include id as tiebreaker.
+    ("ts", "asc"): _MESSAGES_WHERE.format(id="+id") + " ORDER BY ts ASC, id ASC LIMIT ?",
+    ("ts", "desc"): _MESSAGES_WHERE.format(id="+id") + " ORDER BY ts DESC, id DESC LIMIT ?",
+    ("id", "asc"): _MESSAGES_WHERE.format(id="id") + " ORDER BY id ASC LIMIT ?",
+    ("id", "desc"): _MESSAGES_WHERE.format(id="id") + " ORDER BY id DESC LIMIT ?",
+}
+
+_NAME_HISTORY_SQL = {
+    "asc": "SELECT seen_at, short, long FROM names WHERE node_id=? ORDER BY id ASC LIMIT ?",
+    "desc": "SELECT seen_at, short, long FROM names WHERE node_id=? ORDER BY id DESC LIMIT ?",
+}
+
+# Per-connection prepared-statement cache size (sqlite3 default: 128).
+_CACHED_STATEMENTS = 256
+
+# Max node_ids kept in each per-node read cache (latest name, station summary).
+_NODE_CACHE_MAX = 1024
+
+
+def _conv_key(conversation_type: str, channel: Optional[int], peer_id: Optional[str]) -> str:
+    """
+    Single-column conversation key: 'type|channel|peer_id' (None -> '').
+
+    Must match the SQL backfill expression in BotDB._init().
+    """
+    return f"{conversation_type}|{'' if channel is None else int(channel)}|{peer_id or ''}"
 
 
 class BotDB:
@@ -31,16 +86,42 @@ class BotDB:
 
     def __init__(self, path: str) -> None:
         self.path = path
+        # Writer lock: held for every write transaction. Reads do not take it.
         self._lock = threading.Lock()
 
-        # A single connection is sufficient here. We protect it with a lock.
-        self._conn = sqlite3.connect(self.path, check_same_thread=False)
-        self._conn.row_factory = sqlite3.Row
+        # Per-thread connections (see _conn); all of them are tracked for close().
+        self._tls = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+
+        # LRU read caches keyed by node_id, invalidated after commits that change the node.
+        # _cache_gen is bumped on every invalidation: a reader only stores its result if
+        # no invalidation happened while it was querying (so it cannot store a stale row).
+        self._name_cache: "OrderedDict[str, Tuple[Optional[str], Optional[str]]]" = OrderedDict()
+        self._summary_cache: "OrderedDict[str, Tuple[Optional[int], Optional[int], int]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_gen = 0
+
+        # WAL is persistent in the database file; set it once.
+        self._conn.execute("PRAGMA journal_mode=WAL")
         self._init()
 
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """The calling thread's connection (opened on first use)."""
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=_CACHED_STATEMENTS)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._tls.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
     def _init(self) -> None:
         """Create tables and indexes if they do not exist yet."""
-        with self._conn:
+        with self._lock, self._conn:
             self._conn.execute(
                 """CREATE TABLE IF NOT EXISTS stations (
                     node_id TEXT PRIMARY KEY,
@@ -73,17 +154,29 @@ class BotDB:
                     name_long TEXT,
                     node_key TEXT, -- which TCP node connection received/sent it (host:port)
                     direction TEXT NOT NULL, -- 'rx'/'tx'
-                    message TEXT NOT NULL
+                    message TEXT NOT NULL,
+                    conv_key TEXT -- see _conv_key()
                 )"""
             )
-            self._conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_messages_conv ON messages(conversation_type, channel, peer_id, id DESC)"
-            )
+
+            # Migration: older databases lack conv_key; add and backfill it once.
+            cols = {r["name"] for r in self._conn.execute("PRAGMA table_info(messages)")}
+            if "conv_key" not in cols:
+                self._conn.execute("ALTER TABLE messages ADD COLUMN conv_key TEXT")
+                self._conn.execute(
+                    "UPDATE messages SET conv_key = conversation_type||'|'||COALESCE(channel,'')||'|'||COALESCE(peer_id,'')"
+                )
+            # Conversations are looked up by conv_key alone; the old 3-column index is superseded.
+            self._conn.execute("DROP INDEX IF EXISTS idx_messages_conv")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_msg_ck_id ON messages(conv_key, id DESC)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_msg_ck_ts_id ON messages(conv_key, ts, id)")
 
     def close(self) -> None:
-        """Close the underlying SQLite connection."""
-        with self._lock:
-            self._conn.close()
+        """Close all SQLite connections (of every thread)."""
+        with self._lock, self._conns_lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns.clear()
 
     # ---- stations / names -------------------------------------------------
 
@@ -97,14 +190,17 @@ class BotDB:
         if not node_id:
             return
         with self._lock, self._conn:
-            row = self._conn.execute("SELECT node_id FROM stations WHERE node_id=?", (node_id,)).fetchone()
-            if row is None:
-                self._conn.execute(
-                    "INSERT INTO stations(node_id, first_seen, last_seen) VALUES(?,?,?)",
-                    (node_id, int(ts), int(ts)),
-                )
-            else:
-                self._conn.execute("UPDATE stations SET last_seen=? WHERE node_id=?", (int(ts), node_id))
+            self._touch_station(node_id, ts)
+        self._invalidate((node_id,), ())
+
+    def _touch_station(self, node_id: str, ts: int) -> None:
+        """touch_station() body. Caller must hold self._lock and an open transaction."""
+        # Single statement: insert, or bump last_seen of the existing row (first_seen is kept).
+        self._conn.execute(
+            "INSERT INTO stations(node_id, first_seen, last_seen) VALUES(?,?,?) "
+            "ON CONFLICT(node_id) DO UPDATE SET last_seen=excluded.last_seen",
+            (node_id, int(ts), int(ts)),
+        )
 
     def record_name(self, node_id: str, ts: int, short: Optional[str], long: Optional[str]) -> None:
         """
@@ -120,26 +216,70 @@ class BotDB:
         if not short_s and not long_s:
             return
         with self._lock, self._conn:
-            last = self._conn.execute(
-                "SELECT short,long FROM names WHERE node_id=? ORDER BY id DESC LIMIT 1", (node_id,)
-            ).fetchone()
-            if last is not None:
-                if (last["short"] or None) == (short_s or None) and (last["long"] or None) == (long_s or None):
-                    return
-            self._conn.execute(
-                "INSERT INTO names(node_id, seen_at, short, long) VALUES(?,?,?,?)",
-                (node_id, int(ts), short_s, long_s),
-            )
+            changed = self._record_name(node_id, ts, short_s, long_s)
+        if changed:
+            self._invalidate((node_id,), (node_id,))
+
+    def _record_name(self, node_id: str, ts: int, short_s: Optional[str], long_s: Optional[str]) -> bool:
+        """
+        record_name() body for normalized names; returns True if a row was inserted.
+
+        Caller must hold self._lock and an open transaction.
+        """
+        # Insert only if the newest row differs; the comparison runs inside SQLite.
+        # Stored names are already normalized (stripped, empty -> NULL), so "IS" is exact.
+        cur = self._conn.execute(
+            """INSERT INTO names(node_id, seen_at, short, long)
+               SELECT ?,?,?,?
+               WHERE NOT EXISTS (
+                   SELECT 1 FROM (SELECT short, long FROM names WHERE node_id=? ORDER BY id DESC LIMIT 1)
+                   WHERE short IS ? AND long IS ?
+               )""",
+            (node_id, int(ts), short_s, long_s, node_id, short_s, long_s),
+        )
+        return cur.rowcount > 0
+
+    # ---- per-node read caches ---------------------------------------------
+
+    def _cache_get(self, cache: "OrderedDict[str, Any]", node_id: str) -> Tuple[Any, int]:
+        """Return (cached value or None, current generation)."""
+        with self._cache_lock:
+            val = cache.get(node_id)
+            if val is not None:
+                cache.move_to_end(node_id)
+            return val, self._cache_gen
+
+    def _cache_put(self, cache: "OrderedDict[str, Any]", node_id: str, val: Any, gen: int) -> None:
+        """Store a freshly read value, unless an invalidation happened since generation 'gen'."""
+        with self._cache_lock:
+            if gen != self._cache_gen:
+                return
+            cache[node_id] = val
+            if len(cache) > _NODE_CACHE_MAX:
+                cache.popitem(last=False)
+
+    def _invalidate(self, stations: Iterable[str], names: Iterable[str]) -> None:
+        """Drop cached reads for nodes changed by a committed write."""
+        with self._cache_lock:
+            self._cache_gen += 1
+            for node_id in stations:
+                self._summary_cache.pop(node_id, None)
+            for node_id in names:
+                # A new name row changes both the latest name and the summary's row count.
+                self._name_cache.pop(node_id, None)
+                self._summary_cache.pop(node_id, None)
 
     def get_latest_name(self, node_id: str) -> Tuple[Optional[str], Optional[str]]:
-        """Return latest (short,long) for a node, or (None,None)."""
-        with self._lock:
-            row = self._conn.execute(
-                "SELECT short,long FROM names WHERE node_id=? ORDER BY id DESC LIMIT 1", (node_id,)
-            ).fetchone()
-            if not row:
-                return None, None
-            return row["short"], row["long"]
+        """Return latest (short,long) for a node, or (None,None). Cached per node_id."""
+        val, gen = self._cache_get(self._name_cache, node_id)
+        if val is not None:
+            return val
+        row = self._conn.execute(
+            "SELECT short,long FROM names WHERE node_id=? ORDER BY id DESC LIMIT 1", (node_id,)
+        ).fetchone()
+        val = (row["short"], row["long"]) if row else (None, None)
+        self._cache_put(self._name_cache, node_id, val, gen)
+        return val
 
     def get_name_history(
         self, node_id: str, limit: int = 50, order: str = "desc"
@@ -154,35 +294,40 @@ class BotDB:
         ord_norm = (order or "desc").strip().lower()
         if ord_norm not in ("asc", "desc"):
             ord_norm = "desc"
-        with self._lock:
-            rows = self._conn.execute(
-                f"SELECT seen_at, short, long FROM names WHERE node_id=? ORDER BY id {ord_norm.upper()} LIMIT ?",
-                (node_id, int(limit)),
-            ).fetchall()
-            return [(int(r["seen_at"]), r["short"], r["long"]) for r in rows]
+        rows = self._conn.execute(_NAME_HISTORY_SQL[ord_norm], (node_id, int(limit))).fetchall()
+        return [(int(r["seen_at"]), r["short"], r["long"]) for r in rows]
 
     def get_station_summary(self, node_id: str) -> Tuple[Optional[int], Optional[int], int]:
-        """Return (first_seen, last_seen, number_of_name_rows) or (None,None,0) if not present."""
-        with self._lock:
-            row = self._conn.execute(
-                "SELECT first_seen,last_seen FROM stations WHERE node_id=?", (node_id,)
-            ).fetchone()
-            if row is None:
-                return None, None, 0
-            cnt = self._conn.execute("SELECT COUNT(*) AS c FROM names WHERE node_id=?", (node_id,)).fetchone()
-            return int(row["first_seen"]), int(row["last_seen"]), int(cnt["c"]) if cnt else 0
+        """
+        Return (first_seen, last_seen, number_of_name_rows) or (None,None,0) if not present.
+
+        Cached per node_id.
+        """
+        val, gen = self._cache_get(self._summary_cache, node_id)
+        if val is not None:
+            return val
+        row = self._conn.execute(
+            """SELECT first_seen, last_seen,
+                      (SELECT COUNT(*) FROM names WHERE names.node_id=stations.node_id) AS c
+               FROM stations WHERE node_id=?""",
+            (node_id,),
+        ).fetchone()
+        if row is None:
+            val = (None, None, 0)
+        else:
+            val = (int(row["first_seen"]), int(row["last_seen"]), int(row["c"]))
+        self._cache_put(self._summary_cache, node_id, val, gen)
+        return val
 
     def count_stations(self) -> int:
         """Count known stations (db users)."""
-        with self._lock:
-            row = self._conn.execute("SELECT COUNT(*) AS c FROM stations").fetchone()
-            return int(row["c"]) if row else 0
+        row = self._conn.execute("SELECT COUNT(*) AS c FROM stations").fetchone()
+        return int(row["c"]) if row else 0
 
     def count_name_rows(self) -> int:
         """Count name history rows."""
-        with self._lock:
-            row = self._conn.execute("SELECT COUNT(*) AS c FROM names").fetchone()
-            return int(row["c"]) if row else 0
+        row = self._conn.execute("SELECT COUNT(*) AS c FROM names").fetchone()
+        return int(row["c"]) if row else 0
 
     # ---- messages ---------------------------------------------------------
 
@@ -208,11 +353,10 @@ class BotDB:
             If keep > 0, we keep only the newest 'keep' rows for the same conversation:
               conversation is identified by (conversation_type, channel, peer_id).
         """
+        ck = _conv_key(conversation_type, channel, peer_id)
         with self._lock, self._conn:
             self._conn.execute(
-                """INSERT INTO messages(ts, conversation_type, channel, channel_name, peer_id, user_id,
-                                          name_short, name_long, node_key, direction, message)
-                   VALUES(?,?,?,?,?,?,?,?,?,?,?)""",
+                _INSERT_MESSAGE_SQL,
                 (
                     int(ts),
                     conversation_type,
@@ -225,38 +369,74 @@ class BotDB:
                     node_key,
                     direction,
                     message,
+                    ck,
                 ),
             )
-            if keep and keep > 0:
-                # Delete everything except the newest 'keep' rows of that same conversation.
-                self._conn.execute(
-                    """DELETE FROM messages
-                       WHERE id NOT IN (
-                           SELECT id FROM messages
-                           WHERE conversation_type=? AND
-                                 ( (channel IS ?) OR (channel = ?) ) AND
-                                 ( (peer_id IS ?) OR (peer_id = ?) )
-                           ORDER BY id DESC
-                           LIMIT ?
-                       )
-                       AND conversation_type=? AND
-                           ( (channel IS ?) OR (channel = ?) ) AND
-                           ( (peer_id IS ?) OR (peer_id = ?) )
-                    """,
-                    (
-                        conversation_type,
-                        channel,
-                        int(channel) if channel is not None else None,
-                        peer_id,
-                        peer_id,
-                        int(keep),
-                        conversation_type,
-                        channel,
-                        int(channel) if channel is not None else None,
-                        peer_id,
-                        peer_id,
-                    ),
-                )
+            self._prune(ck, keep)
+
+    def write_batch(self, ops: Iterable[Tuple[str, Tuple[Any, ...]]], keep: int) -> None:
+        """
+        Apply a batch of queued writes in a single transaction.
+
+        Each op is (kind, args):
+          - ("station", (node_id, ts))                     -> touch_station()
+          - ("name", (node_id, ts, short, long))           -> record_name()
+          - ("message", row) with row in _INSERT_MESSAGE_SQL column order (without conv_key):
+                (ts, conversation_type, channel, channel_name, peer_id, user_id,
+                 name_short, name_long, node_key, direction, message)
+
+        Used by the bot's write-behind queue so bursts of packets share one commit.
+        Each op has the same effect as the corresponding single-row method: message
+        rows are inserted with one executemany() and retention is then applied once
+        per affected conversation (same result as add_message() per row).
+        """
+        messages: List[Tuple[Any, ...]] = []
+        stations: Set[str] = set()
+        names: Set[str] = set()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            for kind, args in ops:
+                if kind == "message":
+                    messages.append((*args, _conv_key(args[1], args[2], args[4])))
+                elif kind == "station":
+                    if args[0]:
+                        self._touch_station(*args)
+                        stations.add(args[0])
+                elif kind == "name":
+                    node_id, ts, short, long = args
+                    short_s = short.strip() if isinstance(short, str) and short.strip() else None
+                    long_s = long.strip() if isinstance(long, str) and long.strip() else None
+                    if node_id and (short_s or long_s) and self._record_name(node_id, ts, short_s, long_s):
+                        names.add(node_id)
+            if messages:
+                self._conn.executemany(_INSERT_MESSAGE_SQL, messages)
+                # conv_key of each affected conversation, de-duplicated in insertion order
+                for ck in dict.fromkeys(m[11] for m in messages):
+                    self._prune(ck, keep)
+        # After the commit, so readers cannot re-cache the pre-commit rows.
+        if stations or names:
+            self._invalidate(stations, names)
+
+    def _prune(self, conv_key: str, keep: int) -> None:
+        """
+        Delete everything except the newest 'keep' rows of one conversation.
+
+        Caller must hold self._lock and an open transaction.
+        """
+        if keep and keep > 0:
+            # Find the row just past the newest 'keep' rows and delete it and everything older.
+            # Both halves are seeks on idx_msg_ck_id.
+            self._conn.execute(
+                """DELETE FROM messages
+                   WHERE conv_key=? AND
+                         id <= COALESCE((
+                             SELECT id FROM messages WHERE conv_key=?
+                             ORDER BY id DESC
+                             LIMIT 1 OFFSET ?
+                         ), -1)
+                """,
+                (conv_key, conv_key, int(keep)),
+            )
 
     def get_messages(
         self,
@@ -292,39 +472,14 @@ class BotDB:
         if sort_norm not in ("id", "ts"):
             sort_norm = "id"
 
-        q = """SELECT id, ts, conversation_type, channel, channel_name, peer_id, user_id, name_short, name_long,
-                       node_key, direction, message
-               FROM messages
-               WHERE conversation_type=? AND
-                     ( (channel IS ?) OR (channel = ?) ) AND
-                     ( (peer_id IS ?) OR (peer_id = ?) )
-            """
-        params: List[Any] = [
-            conversation_type,
-            channel,
-            int(channel) if channel is not None else None,
-            peer_id,
-            peer_id,
-        ]
-
-        if direction_filter in ("rx", "tx"):
-            q += " AND direction = ?"
-            params.append(direction_filter)
-
-        if before_id is not None:
-            q += " AND id < ?"
-            params.append(int(before_id))
-        if after_id is not None:
-            q += " AND id > ?"
-            params.append(int(after_id))
-
-        # Stable ordering: if sorting by ts, include id as tiebreaker.
-        if sort_norm == "ts":
-            q += f" ORDER BY ts {ord_norm.upper()}, id {ord_norm.upper()} LIMIT ?"
-        else:
-            q += f" ORDER BY id {ord_norm.upper()} LIMIT ?"
-        params.append(int(limit))
-
-        with self._lock:
-            rows = self._conn.execute(q, tuple(params)).fetchall()
-            return [dict(r) for r in rows]
+        direction = direction_filter if direction_filter in ("rx", "tx") else None
+        params = (
+            _conv_key(conversation_type, channel, peer_id),
+            direction,
+            direction,
+            int(before_id) if before_id is not None else None,
+            int(after_id) if after_id is not None else None,
+            int(limit),
+        )
+        rows = self._conn.execute(_MESSAGES_SQL[(sort_norm, ord_norm)], params).fetchall()
+        return [dict(r) for r in rows]
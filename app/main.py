@@ -7,24 +7,24 @@ What this module does
 1) Determine the config file path (CONFIG_PATH env var, default: /config/config.toml)
 2) Create a default config file if it does not exist yet
 3) Load config, set up logging (incl. TRACE)
-4) Start MeshBot (node connections + bot loop + scheduler)
-5) Start FastAPI/uvicorn in a background thread
+4) Start FastAPI/uvicorn in a background thread (answers 503 until the bot is ready)
+5) Start MeshBot (node connections + bot loop + scheduler)
 
-The container stays alive by keeping the main thread in an infinite sleep loop.
+The container stays alive by parking the main thread on an Event until SIGINT/SIGTERM.
 """
 
 from __future__ import annotations
 
+import importlib.util
 import os
 import logging
+import signal
+import sys
 import threading
-import time
+from typing import Tuple
 
-import uvicorn
-
-from .config import load_config, save_config, AppCfg
+from .config import load_config, config_to_toml, AppCfg
 from .bot import MeshBot, TRACE, install_trace_level
-from .api import create_app
 
 
 def _setup_logging(level: str) -> None:
@@ -41,6 +41,17 @@ def _setup_logging(level: str) -> None:
         logging.basicConfig(level=getattr(logging, lvl, logging.INFO), format="%(asctime)s %(levelname)s %(message)s")
 
 
+# Log levels understood by uvicorn (it has its own TRACE level as well).
+_UVICORN_LOG_LEVELS = ("critical", "error", "warning", "info", "debug", "trace")
+
+
+def _uvicorn_impls() -> Tuple[str, str]:
+    """Return uvicorn (loop, http) implementations: uvloop/httptools if installed, else asyncio/h11."""
+    loop = "uvloop" if importlib.util.find_spec("uvloop") is not None else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") is not None else "h11"
+    return loop, http
+
+
 def ensure_default_config(path: str) -> None:
     """
     Create a default config file on first start.
@@ -48,12 +59,25 @@ def ensure_default_config(path: str) -> None:
     This makes the Docker container "bootable" even if the user did not create config.toml yet.
     The user should then edit ./config/config.toml on the host.
     """
-    if os.path.exists(path):
+    # O_EXCL creates the file only if it does not exist yet: a single syscall when it does
+    # (the usual case on restarts). The parent directory is only created when missing.
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+    try:
+        fd = os.open(path, flags, 0o644)
+    except FileExistsError:
         return
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, flags, 0o644)
     cfg = AppCfg()
     cfg.api.tokens = ["CHANGE_ME_TOKEN"]
-    save_config(path, cfg)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(config_to_toml(cfg))
+    except BaseException:
+        # Do not leave an empty/partial config behind; the next start retries.
+        os.unlink(path)
+        raise
 
 
 def main() -> None:
@@ -69,36 +93,54 @@ def main() -> None:
         log.error("No nodes configured. Set [nodes].list in config.toml")
         return
 
-    # Start the bot (connections + threads)
+    # Create the bot (config, DB, plugin manager; nothing is started yet)
     bot = MeshBot(cfg=cfg, config_path=config_path, logger=log)
-    # --- diagnostics: confirm which bot.py is running inside the container ---
-    try:
-        import app.bot as _b
-        log.info("bot module file: %s", getattr(_b, "__file__", "?"))
-        log.info("MeshBot has _loop=%s start=%s", hasattr(_b.MeshBot, "_loop"), hasattr(_b.MeshBot, "start"))
-    except Exception as _e:
-        log.warning("bot diagnostics failed: %r", _e)
-    bot.start()
-
-    # Create and start the API server in a separate thread
-    app = create_app(bot)
+    # --- diagnostics: confirm which bot.py is running inside the container (DEBUG only) ---
+    if log.isEnabledFor(logging.DEBUG):
+        try:
+            # MeshBot is already imported; look its module up instead of importing again.
+            _b = sys.modules[MeshBot.__module__]
+            log.debug("bot module file: %s", getattr(_b, "__file__", "?"))
+            log.debug("MeshBot has _loop=%s start=%s", hasattr(MeshBot, "_loop"), hasattr(MeshBot, "start"))
+        except Exception as _e:
+            log.warning("bot diagnostics failed: %r", _e)
+
+    # Create and start the API server in a separate thread.
+    # It starts before bot.start() so uvicorn/FastAPI initialize while plugins load and
+    # node connections come up; protected routes answer 503 until bot.is_ready().
     host = cfg.api.listen_host or "0.0.0.0"
     port = int(cfg.api.listen_port or 8080)
     log.info("Starting API on http://%s:%s", host, port)
 
     # Run Uvicorn in a background thread.
-    # Docker keeps the container alive via the main thread sleep loop.
+    # Docker keeps the container alive via the main thread waiting below.
+    # uvloop + httptools come with uvicorn[standard]; fall back to asyncio/h11 if missing.
+    # Access logs are off (one log line per request); uvicorn follows the configured log level.
+    loop, http = _uvicorn_impls()
+    uv_level = (cfg.logging.level or "INFO").lower()
+    if uv_level not in _UVICORN_LOG_LEVELS:
+        uv_level = "info"
+
     def run_api() -> None:
-        uvicorn.run(app, host=host, port=port, log_level="info")
+        # uvicorn and FastAPI (starlette, pydantic, ...) are imported here, on the API thread,
+        # so the main thread never pays for them.
+        import uvicorn
+        from .api import create_app
+
+        app = create_app(bot)
+        uvicorn.run(app, host=host, port=port, log_level=uv_level, loop=loop, http=http, access_log=False)
 
     threading.Thread(target=run_api, name="api", daemon=True).start()
 
-    # Keep container running
+    # Start the bot (connections + threads)
+    bot.start()
+
+    # Keep container running: block until SIGINT (Ctrl+C) or SIGTERM (docker stop).
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
     try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        pass
+        stop.wait()
     finally:
         bot.stop()
 
@@ -15,20 +15,65 @@ The plugin instance is "duck typed" and may implement any of these optional call
 - on_stop()
 - on_tick(now_ts: int)
 - on_packet(packet: dict, interface: Any, node_key: str)
-- on_text(text: str, meta: dict)
-- on_command(cmd_key: str, text: str, meta: dict) -> Optional[bool]
-  If any plugin returns True, default command handling is skipped.
+- on_text(text: str, meta: Meta)
+- on_command(cmd_key: str, text: str, meta: Meta) -> Optional[bool]
+  The first plugin that returns True handles the command: later plugins are not
+  called and default command handling is skipped.
 - on_reply(text: str, meta: dict)
 
+For one message, on_text and on_command receive the same read-only Meta (a NamedTuple):
+read fields as attributes (meta.channel, meta.is_dm, ...). The old dict-style access
+(meta.get("channel"), meta["channel"], dict(meta)) still works for existing plugins;
+use meta._asdict() for a modifiable copy.
+
 All callback invocations are protected by try/except so faulty plugins cannot crash the bot.
 """
 
 from __future__ import annotations
 
 import importlib.util
+import logging
+import os
 import pathlib
+import py_compile
+from concurrent.futures import ThreadPoolExecutor
 from types import ModuleType
-from typing import Any, List, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+# Max threads used to import plugin modules concurrently at startup.
+LOAD_WORKERS = 8
+
+class Meta(NamedTuple):
+    """Metadata of one incoming text message, passed to on_text and on_command."""
+    from_id: Optional[str]
+    channel: int  # always an int channel index (0 if the packet had none)
+    channel_name: str
+    is_dm: bool
+    node_key: Optional[str]
+    short: Optional[str]
+    long: Optional[str]
+    packet: Dict[str, Any]
+    reply_dest: str
+
+    # Dict-style access for plugins written against the former dict meta.
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _META_FIELDS else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def __getitem__(self, key: Any) -> Any:
+        if type(key) is str:
+            if key not in _META_FIELDS:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+
+_META_FIELDS = frozenset(Meta._fields)
+
+# Optional plugin callbacks; bound methods are collected per name at load time.
+CALLBACKS = ("on_start", "on_stop", "on_tick", "on_packet", "on_text", "on_reply", "on_command")
 
 
 class PluginManager:
@@ -38,41 +83,87 @@ class PluginManager:
         self.enabled = enabled
         self.log = log
         self.plugins: List[Any] = []
-        self.modules: List[ModuleType] = []
+        # callback name -> bound methods of the plugins that implement it (load order)
+        self._handlers: Dict[str, List[Callable[..., Any]]] = {name: [] for name in CALLBACKS}
 
     def load_all(self) -> None:
         self.plugins.clear()
-        self.modules.clear()
+        for handlers in self._handlers.values():
+            handlers.clear()
 
         if not self.enabled:
             self.log.info("Plugins disabled.")
             return
 
-        folder = pathlib.Path(self.path)
-        if not folder.exists() or not folder.is_dir():
+        # One directory scan: DirEntry.is_file() uses the d_type from the listing (no stat per entry).
+        try:
+            with os.scandir(self.path) as it:
+                entries = [
+                    (e.name.lower(), e.path)
+                    for e in it
+                    if e.name.endswith(".py") and not e.name.startswith("_") and e.is_file()
+                ]
+        except (FileNotFoundError, NotADirectoryError):
             self.log.info("Plugin directory not found: %s", self.path)
             return
-
-        files = sorted(
-            [p for p in folder.iterdir() if p.is_file() and p.suffix == ".py" and not p.name.startswith("_")],
-            key=lambda p: p.name.lower(),
-        )
-        self.log.info("Plugins: loading %d file(s) from %s", len(files), str(folder))
-
-        for f in files:
+        entries.sort()
+        files = [pathlib.Path(path) for _, path in entries]
+        self.log.info("Plugins: loading %d file(s) from %s", len(files), self.path)
+
+        # Import modules concurrently (file reads, compiles and their own imports overlap),
+        # then instantiate sequentially so plugins keep their alphabetical order.
+        if len(files) > 1:
+            with ThreadPoolExecutor(max_workers=min(LOAD_WORKERS, len(files)), thread_name_prefix="plugin-load") as ex:
+                loaded = list(ex.map(self._try_load_module, files))
+        else:
+            loaded = [self._try_load_module(f) for f in files]
+
+        for f, mod in loaded:
+            name = f.name
             try:
-                mod = self._load_module(f)
-                self.modules.append(mod)
+                if isinstance(mod, Exception):
+                    raise mod
                 inst = self._instantiate(mod)
                 if inst is None:
-                    self.log.warning("Plugin %s has no setup()/Plugin/register()", f.name)
+                    self.log.warning("Plugin %s has no setup()/Plugin/register()", name)
                     continue
                 self.plugins.append(inst)
-                self.log.info("Plugins: loaded %s", f.name)
+                self._register(inst)
+                self.log.info("Plugins: loaded %s", name)
             except Exception as e:
-                self.log.error("Plugins: failed to load %s: %r", f.name, e)
+                self.log.error("Plugins: failed to load %s: %r", name, e)
+
+    def _try_load_module(self, filepath: pathlib.Path) -> Tuple[pathlib.Path, Union[ModuleType, Exception]]:
+        """_load_module() for the loader pool: returns the exception instead of raising it."""
+        try:
+            return filepath, self._load_module(filepath)
+        except Exception as e:
+            return filepath, e
+
+    def _ensure_bytecode(self, filepath: pathlib.Path) -> None:
+        """
+        Write the plugin's __pycache__ .pyc if it is missing or older than the source.
+
+        The container runs with PYTHONDONTWRITEBYTECODE, so the import system never caches
+        plugin bytecode itself (it does read a valid .pyc). Compiling once here lets later
+        starts skip parsing/compiling unchanged plugins. Best effort: a read-only plugin
+        directory just means no cache.
+        """
+        src = str(filepath)
+        try:
+            cfile = importlib.util.cache_from_source(src)
+            try:
+                if os.stat(cfile).st_mtime >= os.stat(src).st_mtime:
+                    return
+            except FileNotFoundError:
+                pass
+            # quiet=2: syntax errors are reported by the import below instead.
+            py_compile.compile(src, cfile=cfile, doraise=False, quiet=2)
+        except Exception as e:
+            self.log.debug("Plugins: no bytecode cache for %s: %r", filepath.name, e)
 
     def _load_module(self, filepath: pathlib.Path) -> ModuleType:
+        self._ensure_bytecode(filepath)
         name = f"bot_plugin_{filepath.stem}"
         spec = importlib.util.spec_from_file_location(name, str(filepath))
         if spec is None or spec.loader is None:
@@ -92,44 +183,72 @@ class PluginManager:
             return mod.register(self.bot)  # type: ignore[attr-defined]
         return None
 
-    def _call(self, plugin: Any, method: str, *args: Any, **kwargs: Any) -> Any:
-        fn = getattr(plugin, method, None)
-        if not callable(fn):
-            return None
-        try:
-            return fn(*args, **kwargs)
-        except Exception as e:
-            self.log.warning("Plugin error in %s.%s: %r", plugin.__class__.__name__, method, e)
-            return None
+    def _register(self, plugin: Any) -> None:
+        """Collect the callbacks a plugin implements, so dispatch skips the others."""
+        for name in CALLBACKS:
+            fn = getattr(plugin, name, None)
+            if callable(fn):
+                self._handlers[name].append(fn)
+
+    def has(self, name: str) -> bool:
+        """True if any loaded plugin implements callback 'name' (lets callers skip dispatch)."""
+        return bool(self._handlers.get(name))
+
+    def _error(self, fn: Callable[..., Any], e: Exception) -> None:
+        """Log a failed callback as '<PluginClass>.<method>' (skipped entirely if WARNING is filtered)."""
+        if not self.log.isEnabledFor(logging.WARNING):
+            return
+        plugin = getattr(fn, "__self__", None)
+        self.log.warning("Plugin error in %s.%s: %r", type(plugin).__name__, getattr(fn, "__name__", "?"), e)
 
     def on_start(self) -> None:
-        for p in self.plugins:
-            self._call(p, "on_start")
+        for fn in self._handlers["on_start"]:
+            try:
+                fn()
+            except Exception as e:
+                self._error(fn, e)
 
     def on_stop(self) -> None:
-        for p in self.plugins:
-            self._call(p, "on_stop")
+        for fn in self._handlers["on_stop"]:
+            try:
+                fn()
+            except Exception as e:
+                self._error(fn, e)
 
     def on_tick(self, now_ts: int) -> None:
-        for p in self.plugins:
-            self._call(p, "on_tick", now_ts)
+        for fn in self._handlers["on_tick"]:
+            try:
+                fn(now_ts)
+            except Exception as e:
+                self._error(fn, e)
 
     def on_packet(self, packet: dict, interface: Any, node_key: str) -> None:
-        for p in self.plugins:
-            self._call(p, "on_packet", packet, interface, node_key)
+        for fn in self._handlers["on_packet"]:
+            try:
+                fn(packet, interface, node_key)
+            except Exception as e:
+                self._error(fn, e)
 
-    def on_text(self, text: str, meta: dict) -> None:
-        for p in self.plugins:
-            self._call(p, "on_text", text, meta)
+    def on_text(self, text: str, meta: Meta) -> None:
+        for fn in self._handlers["on_text"]:
+            try:
+                fn(text, meta)
+            except Exception as e:
+                self._error(fn, e)
 
     def on_reply(self, text: str, meta: dict) -> None:
-        for p in self.plugins:
-            self._call(p, "on_reply", text, meta)
-
-    def on_command(self, cmd_key: str, text: str, meta: dict) -> bool:
-        handled = False
-        for p in self.plugins:
-            res = self._call(p, "on_command", cmd_key, text, meta)
-            if res is True:
-                handled = True
-        return handled
+        for fn in self._handlers["on_reply"]:
+            try:
+                fn(text, meta)
+            except Exception as e:
+                self._error(fn, e)
+
+    def on_command(self, cmd_key: str, text: str, meta: Meta) -> bool:
+        # First match wins (load order).
+        for fn in self._handlers["on_command"]:
+            try:
+                if fn(cmd_key, text, meta) is True:
+                    return True
+            except Exception as e:
+                self._error(fn, e)
+        return False
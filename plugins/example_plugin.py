@@ -13,8 +13,8 @@ Callbacks (all optional):
 - on_stop()
 - on_tick(now_ts: int)
 - on_packet(packet: dict, interface: Any, node_key: str)
-- on_text(text: str, meta: dict)
-- on_command(cmd_key: str, text: str, meta: dict) -> Optional[bool]
+- on_text(text: str, meta: Meta)
+- on_command(cmd_key: str, text: str, meta: Meta) -> Optional[bool]
   Return True to mark as handled (skip default handling).
 - on_reply(text: str, meta: dict)
 
@@ -27,14 +27,21 @@ The plugin receives the `bot` object, so it can call:
 
 from __future__ import annotations
 
+import sys
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 
 class ExamplePlugin:
     def __init__(self, bot: Any) -> None:
         self.bot = bot
-        self._last_hello = 0.0
+        # Monotonic deadline (ns) before which no new greeting is sent
+        self._next_hello_ns = 0
+        # Plugin commands: cmd_key -> handler. The bot interns command keys, so interning
+        # the table keys lets dict lookups hit on identity.
+        self._cmds: Dict[str, Callable[[str, Any], None]] = {
+            sys.intern("/hi2"): self._do_hi2,
+        }
 
     def on_start(self) -> None:
         self.bot.log.info("[example_plugin] ready")
@@ -44,25 +51,29 @@ class ExamplePlugin:
         if self.bot.log.isEnabledFor(5):  # TRACE level in this project
             self.bot.log.trace("[example_plugin] RX packet from=%s node=%s", packet.get("fromId"), node_key)
 
-    def on_text(self, text: str, meta: Dict[str, Any]) -> None:
+    def on_text(self, text: str, meta: Any) -> None:
         # Example: greet the channel at most once every 10 minutes.
-        if meta.get("is_dm"):
+        # meta is an app.plugins.Meta NamedTuple: read fields as attributes.
+        if meta.is_dm:
             return
-        now = time.time()
-        if now - self._last_hello < 600:
+        ns = time.monotonic_ns()
+        if ns < self._next_hello_ns:
             return
-        self._last_hello = now
-        ch = int(meta.get("channel") or 0)
+        self._next_hello_ns = ns + 600_000_000_000
+        ch = meta.channel
         #self.bot.api_send_channel(channel=ch, destination_id="^all", text="👋 Hello from example plugin!")
 
-    def on_command(self, cmd_key: str, text: str, meta: Dict[str, Any]) -> Optional[bool]:
-        # Example: add a plugin-only command
-        if cmd_key == "/hi2":
-            dest = meta.get("reply_dest") or "^all"
-            ch = int(meta.get("channel") or 0)
-            self.bot.send_reply("Hi from /hi2 (plugin)!", destination_id=dest, channel_index=ch, node_hint=meta.get("node_key"))
-            return True
-        return None
+    def on_command(self, cmd_key: str, text: str, meta: Any) -> Optional[bool]:
+        # Example: add plugin-only commands (the trigger must exist in [commands].list)
+        handler = self._cmds.get(cmd_key)
+        if handler is None:
+            return None
+        handler(text, meta)
+        return True
+
+    def _do_hi2(self, text: str, meta: Any) -> None:
+        dest = meta.reply_dest or "^all"
+        self.bot.send_reply("Hi from /hi2 (plugin)!", destination_id=dest, channel_index=meta.channel, node_hint=meta.node_key)
 
     def on_stop(self) -> None:
         self.bot.log.info("[example_plugin] stopped")
@@ -38,6 +38,9 @@ NINA_INCLUDE_POLICE=false            (default false)
 NINA_INCLUDE_DWD=true                (default true)
 NINA_INCLUDE_MOWAS=true              (default true)
 
+If the optional ijson package is installed, the Destatis regions dataset is parsed
+while it downloads instead of being held in memory as a whole.
+
 """
 
 from __future__ import annotations
@@ -50,8 +53,18 @@ import re
 import sqlite3
 import threading
 import time
-import urllib.request
-from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import ijson  # optional: streaming parse of the Destatis dataset
+except ImportError:
+    ijson = None
 
 
 # ---------------------------------------------------------------------
@@ -87,15 +100,53 @@ def _env_csv(name: str) -> List[str]:
     return [x.strip() for x in v.split(",") if x.strip()]
 
 
-def _http_get_json(url: str, timeout: int = 30) -> Any:
-    req = urllib.request.Request(
-        url,
-        headers={"User-Agent": "meshtastic-bot-nina-plugin/2.4", "Accept": "application/json"},
-        method="GET",
-    )
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        raw = resp.read()
-    return json.loads(raw.decode("utf-8", errors="replace"))
+# Connect timeout for NINA/Destatis requests; the read timeout is passed per call.
+HTTP_CONNECT_TIMEOUT = 5
+
+# Dashboards fetched concurrently per poll (also the HTTP connection pool size).
+FETCH_WORKERS = 8
+
+
+def _http_session() -> requests.Session:
+    """
+    Keep-alive HTTP session shared by all fetches of the plugin.
+
+    Each poll hits the same NINA host once per ARS; reusing pooled connections
+    saves a TCP + TLS handshake per request.
+    """
+    sess = requests.Session()
+    sess.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=FETCH_WORKERS))
+    sess.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=FETCH_WORKERS))
+    sess.headers.update({"User-Agent": "meshtastic-bot-nina-plugin/2.4", "Accept": "application/json"})
+    return sess
+
+
+def _http_get_json(sess: requests.Session, url: str, timeout: int = 30) -> Any:
+    resp = sess.get(url, timeout=(HTTP_CONNECT_TIMEOUT, timeout))
+    resp.raise_for_status()
+    raw = resp.content
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # orjson rejects invalid UTF-8; keep the lenient stdlib decode for such payloads.
+        return json.loads(raw.decode("utf-8", errors="replace"))
+
+
+# Compiled once: the Destatis load runs these per row (~11k rows).
+_RE_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_RE_NON_DIGIT = re.compile(r"\D")
+_RE_ARS12 = re.compile(r"\d{12}")
+_RE_HHMM = re.compile(r"(\d{2}:\d{2})")
+# Umlaut transliteration for _norm_name (translate() maps to multi-char strings in one pass).
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+
+def _http_stream_json_items(sess: requests.Session, url: str, prefix: str, timeout: int = 30) -> Iterator[Any]:
+    """Yield the items at ijson 'prefix' (e.g. "data.item") while the response downloads."""
+    with sess.get(url, timeout=(HTTP_CONNECT_TIMEOUT, timeout), stream=True) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True
+        yield from ijson.items(resp.raw, prefix)
 
 
 def _compact(s: str, max_len: int = 1200) -> str:
@@ -118,16 +169,15 @@ def _ts_to_local(ts: Any) -> str:
 def _time_hhmm(ts: Any) -> str:
     s = _ts_to_local(ts)
     if s:
-        m = re.search(r"(\d{2}:\d{2})", s)
+        m = _RE_HHMM.search(s)
         if m:
             return m.group(1)
     return time.strftime("%H:%M", time.localtime())
 
 
 def _norm_name(s: str) -> str:
-    s = (s or "").strip().lower()
-    s = s.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
-    s = re.sub(r"[^a-z0-9]+", " ", s)
+    # No strip() needed: the final split() drops outer whitespace.
+    s = _RE_NON_ALNUM.sub(" ", (s or "").lower().translate(_UMLAUTS))
     return " ".join(s.split())
 
 
@@ -177,10 +227,90 @@ STATE_ALIASES: Dict[str, str] = {
 }
 
 
+class ItemFields(NamedTuple):
+    """Fields of one dashboard item, extracted once and shared by identifier + formatting."""
+    title: str
+    sent: Any
+    hhmm: str
+    data_sender: str  # sender from item["data"] only (part of the hash identifier)
+    sender: str       # data_sender, else the top-level sender (used by the source filters)
+    category: str
+
+
+def _explicit_identifier(item: Dict[str, Any]) -> str:
+    return str(item.get("identifier") or item.get("id") or "").strip()
+
+
+def _hash_base(ars: str, fields: ItemFields) -> bytes:
+    """Content hashed into the identifier of items that do not carry one."""
+    return f"{ars}|{fields.title}|{fields.sent}|{fields.data_sender}".encode("utf-8", errors="ignore")
+
+
+def _str_value(v: Any) -> str:
+    return v.strip() if isinstance(v, str) else ""
+
+
+def _first_lang_value(d: Dict[str, Any]) -> Any:
+    return d.get("de") or d.get("DE") or d.get("text") or d.get("value") or d.get("title")
+
+
+def _pick_i18n(i18n: Any) -> str:
+    if isinstance(i18n, dict):
+        for k in ("de", "DE", "text", "value", "title"):
+            v = _str_value(i18n.get(k))
+            if v:
+                return v
+        return ""
+    if isinstance(i18n, str):
+        return i18n.strip()
+    if isinstance(i18n, list):
+        for v in i18n:
+            if isinstance(v, str):
+                v = v.strip()
+                if v:
+                    return v
+            elif isinstance(v, dict):
+                vv = _str_value(_first_lang_value(v))
+                if vv:
+                    return vv
+    return ""
+
+
+def _pick_title(obj: Any) -> str:
+    """Title of a dashboard item (or of its data/payload part), "" if none is found."""
+    if not isinstance(obj, dict):
+        return ""
+    for key in ("i18nTitle", "i18nHeadline", "i18nEvent"):
+        t = _pick_i18n(obj.get(key))
+        if t:
+            return t
+    for key in ("headline", "title", "event", "info", "description", "shortText", "msg", "text"):
+        v = obj.get(key)
+        if isinstance(v, str):
+            v = v.strip()
+            if v:
+                return v
+        elif isinstance(v, dict):
+            vv = _str_value(_first_lang_value(v))
+            if vv:
+                return vv
+    cap = obj.get("cap")
+    if isinstance(cap, dict):
+        for key in ("headline", "event", "description"):
+            v = _str_value(cap.get(key))
+            if v:
+                return v
+    return ""
+
+
 # ---------------------------------------------------------------------
 # SQLite stores
 # ---------------------------------------------------------------------
 
+# Newest posted identifiers kept in memory; has() only queries SQLite for older ones.
+POSTED_CACHE_SEED = 20000
+
+
 class PostedStore:
     def __init__(self, conn: sqlite3.Connection) -> None:
         self.conn = conn
@@ -188,16 +318,49 @@ class PostedStore:
             "CREATE TABLE IF NOT EXISTS posted(identifier TEXT PRIMARY KEY, first_seen_ts INTEGER NOT NULL)"
         )
         self.conn.commit()
+        cur = self.conn.execute(
+            "SELECT identifier FROM posted ORDER BY first_seen_ts DESC LIMIT ?", (POSTED_CACHE_SEED,)
+        )
+        self._cache: Set[str] = {r[0] for r in cur.fetchall()}
+        # All rows fit into the seed: a cache miss is a definite "not posted".
+        self._complete = len(self._cache) < POSTED_CACHE_SEED
 
     def has(self, ident: str) -> bool:
+        if ident in self._cache:
+            return True
+        if self._complete:
+            return False
         cur = self.conn.execute("SELECT 1 FROM posted WHERE identifier=? LIMIT 1", (ident,))
         return cur.fetchone() is not None
 
     def add(self, ident: str) -> None:
+        """Record a posted identifier; written to disk by the next commit()."""
         self.conn.execute(
             "INSERT OR IGNORE INTO posted(identifier, first_seen_ts) VALUES(?,?)",
             (ident, int(time.time())),
         )
+        self._cache.add(ident)
+
+    def claim(self, ident: str) -> bool:
+        """
+        Record ident as posted in one statement; False if it already was.
+        Lets the poller and the startup sender reserve a warning before sending it.
+        """
+        if ident in self._cache:
+            return False
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO posted(identifier, first_seen_ts) VALUES(?,?)",
+            (ident, int(time.time())),
+        )
+        self._cache.add(ident)
+        return cur.rowcount == 1
+
+    def release(self, ident: str) -> None:
+        """Undo claim() for a warning that could not be sent."""
+        self.conn.execute("DELETE FROM posted WHERE identifier=?", (ident,))
+        self._cache.discard(ident)
+
+    def commit(self) -> None:
         self.conn.commit()
 
 
@@ -207,6 +370,7 @@ class RegionsCache:
         self.conn.execute(
             "CREATE TABLE IF NOT EXISTS regions_cache(name_norm TEXT PRIMARY KEY, display_name TEXT NOT NULL, ars TEXT NOT NULL)"
         )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_regions_ars ON regions_cache(ars)")
         self.conn.execute(
             "CREATE TABLE IF NOT EXISTS regions_cache_meta(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
         )
@@ -224,10 +388,11 @@ class RegionsCache:
         cur = self.conn.execute("SELECT COUNT(1) FROM regions_cache")
         return int(cur.fetchone()[0])
 
-    def put(self, name_norm: str, display_name: str, ars: str) -> None:
-        self.conn.execute(
+    def put_many(self, rows: List[Tuple[str, str, str]]) -> None:
+        """Insert (name_norm, display_name, ars) rows; the caller commits."""
+        self.conn.executemany(
             "INSERT OR REPLACE INTO regions_cache(name_norm, display_name, ars) VALUES(?,?,?)",
-            (name_norm, display_name, ars),
+            rows,
         )
 
     def get_ars(self, name_norm: str) -> Optional[str]:
@@ -236,10 +401,15 @@ class RegionsCache:
         return r[0] if r else None
 
     def distinct_ars_by_state(self, state_code: str) -> List[str]:
-        cur = self.conn.execute("SELECT DISTINCT ars FROM regions_cache WHERE ars LIKE ?", (f"{state_code}%",))
+        # A range on ars (instead of LIKE, which never uses the index here) is answered
+        # from idx_regions_ars alone. ARS are digit strings, so this is the state prefix.
+        cur = self.conn.execute(
+            "SELECT DISTINCT ars FROM regions_cache WHERE ars >= ? AND ars < ?",
+            (state_code, f"{state_code}:"),
+        )
         out = []
         for (ars,) in cur.fetchall():
-            if isinstance(ars, str) and re.fullmatch(r"\d{12}", ars):
+            if isinstance(ars, str) and _RE_ARS12.fullmatch(ars):
                 out.append(ars)
         return out
 
@@ -251,23 +421,22 @@ class ArsNameStore:
             "CREATE TABLE IF NOT EXISTS ars_names(ars TEXT PRIMARY KEY, name TEXT NOT NULL, source TEXT NOT NULL)"
         )
         self.conn.commit()
+        # Every write goes through put_many(), so this mirror of the table stays complete.
+        self._names: Dict[str, str] = dict(self.conn.execute("SELECT ars, name FROM ars_names").fetchall())
 
     def get_name(self, ars: str) -> Optional[str]:
-        cur = self.conn.execute("SELECT name FROM ars_names WHERE ars=? LIMIT 1", (ars,))
-        r = cur.fetchone()
-        return r[0] if r else None
+        return self._names.get(ars)
 
-    def put(self, ars: str, name: str, source: str) -> None:
-        # Prefer kreis-level sources over fallbacks.
-        cur = self.conn.execute("SELECT source FROM ars_names WHERE ars=? LIMIT 1", (ars,))
-        r = cur.fetchone()
-        if r:
-            existing = str(r[0] or "")
-            if existing == "kreis":
-                return
-            if source != "kreis":
-                return
-        self.conn.execute("INSERT OR REPLACE INTO ars_names(ars,name,source) VALUES(?,?,?)", (ars, name, source))
+    def sources(self) -> Dict[str, str]:
+        """ars -> source of every stored name."""
+        cur = self.conn.execute("SELECT ars, source FROM ars_names")
+        return {ars: str(source or "") for ars, source in cur.fetchall()}
+
+    def put_many(self, rows: List[Tuple[str, str, str]]) -> None:
+        """Insert (ars, name, source) rows; the caller applies the source preference and commits."""
+        self.conn.executemany("INSERT OR REPLACE INTO ars_names(ars,name,source) VALUES(?,?,?)", rows)
+        for ars, name, _source in rows:
+            self._names[ars] = name
 
 
 # ---------------------------------------------------------------------
@@ -296,23 +465,42 @@ class NinaWarningsPlugin:
         self.include_police = _env_bool("NINA_INCLUDE_POLICE", False)
         self.include_dwd = _env_bool("NINA_INCLUDE_DWD", True)
         self.include_mowas = _env_bool("NINA_INCLUDE_MOWAS", True)
+        # Excluded-source substrings, matched against the lowercased category / sender.
+        cat_terms: List[str] = []
+        snd_terms: List[str] = []
+        if not self.include_police:
+            cat_terms += ["police", "polizei"]
+            snd_terms += ["police", "polizei"]
+        if not self.include_dwd:
+            cat_terms += ["dwd", "wetter"]
+            snd_terms += ["dwd", "wetter"]
+        if not self.include_mowas:
+            cat_terms += ["mowas", "katastroph"]
+            snd_terms += ["mowas"]
+        self._cat_terms = tuple(cat_terms)
+        self._snd_terms = tuple(snd_terms)
 
         self.ars_list = _env_csv("NINA_ARS")
         self.counties = _env_csv("NINA_COUNTIES")
         self.state = _env_str("NINA_STATE", "NRW")
 
+        self._http = _http_session()
+        self._pool: Optional[ThreadPoolExecutor] = None
         self._conn: Optional[sqlite3.Connection] = None
         self._posted: Optional[PostedStore] = None
         self._regions: Optional[RegionsCache] = None
         self._ars_names: Optional[ArsNameStore] = None
 
-        self._resolved_ars: List[str] = []
-        self._next_poll = 0.0
+        # (ars, kreis name) per target; names are resolved once in on_start.
+        self._resolved_targets: List[Tuple[str, str]] = []
+        # Serializes use of the shared SQLite connection (poll, startup sender, on_stop).
+        self._db_lock = threading.Lock()
 
-        self._startup_pending: List[Tuple[str, str]] = []
+        self._startup_pending: Deque[Tuple[str, str]] = deque()
         self._startup_delay_seconds = 20
-        self._stop_flag = False
+        self._stop = threading.Event()
         self._startup_thread: Optional[threading.Thread] = None
+        self._poll_thread: Optional[threading.Thread] = None
 
     # ---------------- lifecycle ----------------
 
@@ -323,17 +511,23 @@ class NinaWarningsPlugin:
             return
 
         os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="nina-fetch")
         self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL + NORMAL: a posted-warning commit no longer fsyncs the main DB file.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA mmap_size=67108864")
         self._posted = PostedStore(self._conn)
         self._regions = RegionsCache(self._conn)
         self._ars_names = ArsNameStore(self._conn)
 
         self._ensure_region_cache()
 
-        self._resolved_ars = self._resolve_targets()
-        _log_info(self.log, "[nina] resolved %d ARS target(s)", len(self._resolved_ars))
+        self._resolved_targets = [(ars, self._kreis_name(ars)) for ars in self._resolve_targets()]
+        _log_info(self.log, "[nina] resolved %d ARS target(s)", len(self._resolved_targets))
 
-        if self._resolved_ars:
+        if self._resolved_targets:
             self._startup_snapshot_and_queue()
 
         _log_info(self.log, "[nina] startup: pending to post=%d (delay=%ss, no-wait, single-attempt)", len(self._startup_pending), self._startup_delay_seconds)
@@ -343,50 +537,100 @@ class NinaWarningsPlugin:
             self._startup_thread = threading.Thread(target=self._startup_sender_once, name="nina-startup-once", daemon=True)
             self._startup_thread.start()
 
-        _log_info(self.log, "[nina] ready. targets=%d ars (channel=%s, interval=%ss)", len(self._resolved_ars), self.channel, self.interval_seconds)
-        self._next_poll = time.time() + 5
+        # Polling runs on its own thread (not on_tick), so slow fetches never stall the bot loop.
+        if self._poll_thread is None:
+            self._poll_thread = threading.Thread(target=self._poll_loop, name="nina-poll", daemon=True)
+            self._poll_thread.start()
+
+        _log_info(self.log, "[nina] ready. targets=%d ars (channel=%s, interval=%ss)", len(self._resolved_targets), self.channel, self.interval_seconds)
 
     def on_stop(self) -> None:
-        self._stop_flag = True
-        try:
-            if self._conn:
-                self._conn.close()
-        except Exception:
-            pass
-        self._conn = None
+        self._stop.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        with self._db_lock:
+            try:
+                if self._conn:
+                    self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+        self._http.close()
 
-    def on_tick(self, now_ts: int) -> None:
-        if not self.enabled:
-            return
+    # ---------------- polling ----------------
 
-        # Periodic polling
-        now = time.time()
-        if now < self._next_poll:
-            return
-        self._next_poll = now + self.interval_seconds
+    def _poll_loop(self) -> None:
+        """First poll 5s after start, then every interval_seconds (start to start) until on_stop."""
+        delay = 5.0
+        while not self._stop.wait(delay):
+            started = time.monotonic()
+            self._poll_once()
+            delay = max(0.0, self.interval_seconds - (time.monotonic() - started))
 
-        if not self._resolved_ars or not self._posted:
+    def _poll_once(self) -> None:
+        if not self._resolved_targets or not self._posted:
             return
 
         try:
             sent = 0
-            for ars in self._resolved_ars:
-                for it in self._fetch_items(ars):
-                    ident = self._identifier_for(it, ars)
-                    if not ident or self._posted.has(ident):
+            for ars, kreis_name, items in self._fetch_all(self._resolved_targets):
+                for it in items:
+                    # Items with their own identifier are deduplicated before any field walk.
+                    fields: Optional[ItemFields] = None
+                    ident = _explicit_identifier(it)
+                    if not ident:
+                        fields = self._extract_fields(it)
+                        ident = self._identifier_for(it, ars, fields)
+                    if self._stop.is_set():
+                        return
+                    if self._is_posted(ident, ars, fields):
                         continue
 
-                    msg = self._format_warning(it, ars)
+                    msg = self._format_warning(it, ars, fields, kreis_name=kreis_name)
                     if not msg:
                         continue
 
-                    self.bot.api_send_channel(channel=int(self.channel), destination_id=self.destination_id, text=msg)
-                    self._posted.add(ident)
+                    if not self._send_claimed(ident, msg):
+                        continue
                     sent += 1
                     if sent >= self.max_per_tick:
                         return
         except Exception as e:
             _log_warning(self.log, "[nina] polling failed: %r", e)
+        finally:
+            # One commit per poll instead of one per posted warning.
+            self._commit_posted()
+
+    def _send_claimed(self, ident: str, msg: str) -> bool:
+        """
+        Claim ident, then send msg. False (nothing sent) if ident was already posted,
+        e.g. by the other of poller / startup sender, or if the bot could not queue the
+        message (no client / node disconnected). A failed send releases the claim, so
+        the warning is tried again later; exceptions are re-raised after the release.
+        """
+        with self._db_lock:
+            if not self._posted or not self._posted.claim(ident):
+                return False
+        try:
+            ok = self.bot.api_send_channel(channel=int(self.channel), destination_id=self.destination_id, text=msg)
+        except Exception:
+            with self._db_lock:
+                self._posted.release(ident)
+            raise
+        if ok is False:
+            with self._db_lock:
+                self._posted.release(ident)
+            return False
+        return True
+
+    def _commit_posted(self) -> None:
+        try:
+            with self._db_lock:
+                if self._posted and self._conn:
+                    self._posted.commit()
+        except Exception as e:
+            _log_warning(self.log, "[nina] saving posted warnings failed: %r", e)
 
     # ---------------- startup sender (single attempt, no wait) ----------------
 
@@ -395,9 +639,9 @@ class NinaWarningsPlugin:
         try:
             if self._startup_delay_seconds > 0:
                 _log_info(self.log, "[nina] startup sender: sleeping %ss before sending startup warnings", self._startup_delay_seconds)
-                time.sleep(self._startup_delay_seconds)
+                self._stop.wait(self._startup_delay_seconds)
 
-            if self._stop_flag or (not self.enabled):
+            if self._stop.is_set() or (not self.enabled):
                 return
 
             if not self._startup_pending:
@@ -412,7 +656,7 @@ class NinaWarningsPlugin:
             _log_info(self.log, "[nina] startup sender: sending %d startup warning(s) (single attempt, no wait)", len(self._startup_pending))
 
             # Drain queue quickly (no retries on error)
-            while self._startup_pending and (not self._stop_flag) and self.enabled:
+            while self._startup_pending and (not self._stop.is_set()) and self.enabled:
                 before = len(self._startup_pending)
                 ok = self._flush_startup_pending_once()
                 if not ok:
@@ -438,16 +682,19 @@ class NinaWarningsPlugin:
 
         to_send = min(len(self._startup_pending), self.max_per_tick)
         sent_ok = 0
-        for _ in range(to_send):
-            ident, msg = self._startup_pending[0]
-            try:
-                self.bot.api_send_channel(channel=int(self.channel), destination_id=self.destination_id, text=msg)
-                self._posted.add(ident)
-                self._startup_pending.pop(0)
-                sent_ok += 1
-            except Exception as e:
-                _log_warning(self.log, "[nina] startup send failed: %r", e)
-                return False
+        try:
+            for _ in range(to_send):
+                ident, msg = self._startup_pending[0]
+                try:
+                    if self._send_claimed(ident, msg):
+                        sent_ok += 1
+                    self._startup_pending.popleft()
+                except Exception as e:
+                    _log_warning(self.log, "[nina] startup send failed: %r", e)
+                    return False
+        finally:
+            if sent_ok:
+                self._commit_posted()
 
         if sent_ok:
             _log_info(self.log, "[nina] startup sender: sent %d, remaining=%d", sent_ok, len(self._startup_pending))
@@ -455,22 +702,43 @@ class NinaWarningsPlugin:
 
     # ---------------- identifiers + field extraction ----------------
 
-    def _identifier_for(self, item: Dict[str, Any], ars: str) -> str:
-        ident = str(item.get("identifier") or item.get("id") or "").strip()
+    def _identifier_for(self, item: Dict[str, Any], ars: str, fields: Optional[ItemFields] = None) -> str:
+        ident = _explicit_identifier(item)
         if ident:
             return ident
-        title = self._get_title(item)
-        sent = self._get_sent(item)
-        sender = ""
+        if fields is None:
+            fields = self._extract_fields(item)
+        return "h2:" + hashlib.blake2b(_hash_base(ars, fields), digest_size=16).hexdigest()
+
+    def _is_posted(self, ident: str, ars: str, fields: Optional[ItemFields]) -> bool:
+        if self._posted is None:
+            return False
+        with self._db_lock:
+            if self._posted.has(ident):
+                return True
+            if fields is None or not ident.startswith("h2:"):
+                return False
+            # Posted before identifiers switched from SHA-1 to BLAKE2b: adopt the new key.
+            if self._posted.has("hash:" + hashlib.sha1(_hash_base(ars, fields)).hexdigest()):
+                self._posted.add(ident)
+                return True
+        return False
+
+    def _extract_fields(self, item: Dict[str, Any]) -> ItemFields:
         data = item.get("data")
+        data_sender = ""
+        category = ""
         if isinstance(data, dict):
             snd = data.get("sender")
             if isinstance(snd, dict):
-                sender = str(snd.get("name") or "").strip()
+                data_sender = str(snd.get("name") or "").strip()
             elif isinstance(snd, str):
-                sender = snd.strip()
-        base = f"{ars}|{title}|{sent}|{sender}"
-        return "hash:" + hashlib.sha1(base.encode("utf-8", errors="ignore")).hexdigest()
+                data_sender = snd.strip()
+            category = str(data.get("provider") or data.get("type") or data.get("category") or "").strip()
+        sender = data_sender or (str(item.get("sender") or "").strip())
+        category = category or (str(item.get("provider") or item.get("type") or item.get("category") or "").strip())
+        sent = self._get_sent(item)
+        return ItemFields(self._get_title(item), sent, _time_hhmm(sent), data_sender, sender, category)
 
     def _get_sent(self, item: Dict[str, Any]) -> Any:
         sent = item.get("sent") or item.get("published") or item.get("timestamp") or item.get("date") or ""
@@ -480,57 +748,15 @@ class NinaWarningsPlugin:
         return sent
 
     def _get_title(self, item: Dict[str, Any]) -> str:
-        def pick_from_i18n(i18n: Any) -> str:
-            if isinstance(i18n, dict):
-                for k in ("de", "DE", "text", "value", "title"):
-                    v = i18n.get(k)
-                    if isinstance(v, str) and v.strip():
-                        return v.strip()
-            if isinstance(i18n, str) and i18n.strip():
-                return i18n.strip()
-            if isinstance(i18n, list):
-                for v in i18n:
-                    if isinstance(v, str) and v.strip():
-                        return v.strip()
-                    if isinstance(v, dict):
-                        vv = v.get("de") or v.get("DE") or v.get("text") or v.get("value") or v.get("title")
-                        if isinstance(vv, str) and vv.strip():
-                            return vv.strip()
-            return ""
-
-        def pick_from_obj(obj: Any) -> str:
-            if not isinstance(obj, dict):
-                return ""
-            for key in ("i18nTitle", "i18nHeadline", "i18nEvent"):
-                t = pick_from_i18n(obj.get(key))
-                if t:
-                    return t
-            for key in ("headline", "title", "event", "info", "description", "shortText", "msg", "text"):
-                v = obj.get(key)
-                if isinstance(v, str) and v.strip():
-                    return v.strip()
-                if isinstance(v, dict):
-                    vv = v.get("de") or v.get("DE") or v.get("text") or v.get("value") or v.get("title")
-                    if isinstance(vv, str) and vv.strip():
-                        return vv.strip()
-            cap = obj.get("cap")
-            if isinstance(cap, dict):
-                for key in ("headline", "event", "description"):
-                    v = cap.get(key)
-                    if isinstance(v, str) and v.strip():
-                        return v.strip()
-            return ""
-
-        t = pick_from_obj(item)
-        if t:
-            return t
-        t = pick_from_obj(item.get("data"))
-        if t:
-            return t
-        t = pick_from_obj(item.get("payload"))
-        if t:
-            return t
-        return ""
+        # Fast path: nearly every dashboard item carries i18nTitle.de.
+        i18n = item.get("i18nTitle")
+        if isinstance(i18n, dict):
+            v = i18n.get("de")
+            if isinstance(v, str):
+                v = v.strip()
+                if v:
+                    return v
+        return _pick_title(item) or _pick_title(item.get("data")) or _pick_title(item.get("payload"))
 
     # ---------------- startup snapshot ----------------
 
@@ -538,21 +764,19 @@ class NinaWarningsPlugin:
         if not self._posted:
             return
 
-        _log_info(self.log, "[nina] startup snapshot: fetching current warnings for %d ARS ...", len(self._resolved_ars))
+        _log_info(self.log, "[nina] startup snapshot: fetching current warnings for %d ARS ...", len(self._resolved_targets))
         shown = 0
         queued = 0
         cap = 300
 
-        for ars in self._resolved_ars:
-            kreis_name = self._ars_names.get_name(ars) if self._ars_names else None
-            if not kreis_name:
-                kreis_name = f"ARS {ars}"
-
-            for it in self._fetch_items(ars):
-                ident = self._identifier_for(it, ars)
-                title = self._get_title(it)
-                hhmm = _time_hhmm(self._get_sent(it))
+        for ars, kreis_name, items in self._fetch_all(self._resolved_targets):
+            for it in items:
+                # One field walk, shared with the identifier and the message.
+                fields = self._extract_fields(it)
+                ident = self._identifier_for(it, ars, fields)
+                hhmm = fields.hhmm
 
+                title = fields.title
                 if not title:
                     dk = sorted(list(it.get("data", {}).keys()))[:20] if isinstance(it.get("data"), dict) else []
                     _log_warning(self.log, "[nina] startup item without title (ars=%s ident=%s keys=%s data_keys=%s)", ars, ident, sorted(list(it.keys()))[:20], dk)
@@ -561,54 +785,58 @@ class NinaWarningsPlugin:
                 _log_info(self.log, _compact(f"[nina][startup] {hhmm} {kreis_name}: {title}", 1400))
                 shown += 1
 
-                msg = self._format_warning(it, ars)
-                if msg and ident and (not self._posted.has(ident)):
+                msg = self._format_warning(it, ars, fields, kreis_name=kreis_name)
+                if msg and ident and (not self._is_posted(ident, ars, fields)):
                     self._startup_pending.append((ident, msg))
                     queued += 1
 
                 if shown >= cap:
                     break
 
+        # Persist identifiers adopted by _is_posted().
+        self._commit_posted()
         _log_info(self.log, "[nina] startup snapshot: done (logged %d warnings).", shown)
         _log_info(self.log, "[nina] startup snapshot: queued %d warning(s) for channel posting.", queued)
 
     # ---------------- targets & region cache ----------------
 
     def _resolve_targets(self) -> List[str]:
+        # Targets are collected into sets and sorted once (stable posting order).
         if self.ars_list:
-            out = []
+            out: Set[str] = set()
             for a in self.ars_list:
-                d = re.sub(r"\D", "", a)
-                if re.fullmatch(r"\d{12}", d):
-                    out.append(d)
+                d = _RE_NON_DIGIT.sub("", a)
+                if _RE_ARS12.fullmatch(d):
+                    out.add(d)
                 else:
                     _log_warning(self.log, "[nina] ignoring invalid ARS: %r", a)
-            return sorted(list(dict.fromkeys(out)))
+            return sorted(out)
 
         if not self._regions:
             return []
 
         if self.counties:
-            out = []
+            found: Set[str] = set()
             for name in self.counties:
                 n = _norm_name(name)
                 ars = self._regions.get_ars(n)
                 if ars:
-                    out.append(ars)
+                    found.add(ars)
                 else:
                     stripped = " ".join([w for w in n.split() if w not in ("landkreis","kreis","stadt","gemeinde","staedteregion","stadteregion")])
                     ars2 = self._regions.get_ars(stripped) if stripped else None
                     if ars2:
-                        out.append(ars2)
+                        found.add(ars2)
                     else:
                         _log_warning(self.log, "[nina] could not resolve county name: %r", name)
-            return sorted(list(dict.fromkeys(out)))
+            return sorted(found)
 
         state_code = STATE_ALIASES.get(_norm_name(self.state)) or "05"
         _log_info(self.log, "[nina] state resolve: state=%s -> code=%s", self.state, state_code)
         ars_all = self._regions.distinct_ars_by_state(state_code)
         _log_info(self.log, "[nina] state resolve: found %d ARS targets for code=%s", len(ars_all), state_code)
-        return sorted(list(dict.fromkeys(ars_all)))
+        # Already distinct (SELECT DISTINCT).
+        return sorted(ars_all)
 
     def _ensure_region_cache(self) -> None:
         if not self._regions or not self._ars_names:
@@ -623,48 +851,87 @@ class NinaWarningsPlugin:
         _log_info(self.log, "[nina] building Landkreis/ARS cache from Destatis dataset ...")
         _log_info(self.log, "[nina] downloading regions dataset: %s", self.DESTATS_RS_JSON_URL)
 
-        data = _http_get_json(self.DESTATS_RS_JSON_URL, timeout=60)
-        rows_data = data.get("daten") if isinstance(data, dict) else None
-        if not isinstance(rows_data, list):
-            raise RuntimeError("Destatis dataset schema unexpected: missing data['daten'] list")
-
-        inserted = 0
+        rows_data: Iterator[Any]
+        if ijson is not None:
+            # A missing 'daten' list yields no rows and fails below as "inserted 0 rows".
+            rows_data = _http_stream_json_items(self._http, self.DESTATS_RS_JSON_URL, "daten.item", timeout=60)
+        else:
+            data = _http_get_json(self._http, self.DESTATS_RS_JSON_URL, timeout=60)
+            daten = data.get("daten") if isinstance(data, dict) else None
+            if not isinstance(daten, list):
+                raise RuntimeError("Destatis dataset schema unexpected: missing data['daten'] list")
+            rows_data = iter(daten)
+
+        regions_rows: List[Tuple[str, str, str]] = []
+        # ars -> (ars, name, source); only the row that finally wins is written.
+        ars_rows: Dict[str, Tuple[str, str, str]] = {}
+        sources = self._ars_names.sources()
         for row in rows_data:
             if not isinstance(row, (list, tuple)) or len(row) < 2:
                 continue
             ars_raw = str(row[0] or "").strip()
             name_s = str(row[1] or "").strip()
-            ars_digits = re.sub(r"\D", "", ars_raw)
-            if not re.fullmatch(r"\d{12}", ars_digits) or not name_s:
+            ars_digits = _RE_NON_DIGIT.sub("", ars_raw)
+            if not name_s or not _RE_ARS12.fullmatch(ars_digits):
                 continue
 
+            # Always 12 digits, since ars_digits is.
             ars_kreis = ars_digits[:5] + "0000000"
-            if not re.fullmatch(r"\d{12}", ars_kreis):
-                continue
 
             n = _norm_name(name_s)
             if not n:
                 continue
 
-            self._regions.put(n, name_s, ars_kreis)
+            regions_rows.append((n, name_s, ars_kreis))
             src = "kreis" if ars_digits.endswith("0000000") else "fallback"
-            self._ars_names.put(ars_kreis, name_s, src)
-            inserted += 1
-
-        self._conn.commit()
+            # Prefer kreis-level sources over fallbacks.
+            existing = sources.get(ars_kreis)
+            if existing is None or (existing != "kreis" and src == "kreis"):
+                sources[ars_kreis] = src
+                ars_rows[ars_kreis] = (ars_kreis, name_s, src)
+
+        # One transaction, one prepared statement per table. The cache is rebuilt from
+        # Destatis if the load is lost, so skip fsyncs while writing it.
+        self._conn.execute("PRAGMA synchronous=OFF")
+        try:
+            with self._conn:
+                self._regions.put_many(regions_rows)
+                self._ars_names.put_many(list(ars_rows.values()))
+        finally:
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        inserted = len(regions_rows)
         if inserted > 0:
             self._regions.set_meta("loaded", "1")
             self._regions.set_meta("loaded_ts", str(int(time.time())))
             self._conn.commit()
+            self._conn.execute("ANALYZE")
             _log_info(self.log, "[nina] region cache ready: %d name->ARS entries", inserted)
         else:
             raise RuntimeError("Regions dataset parsed but inserted 0 rows")
 
     # ---------------- NINA fetch + formatting ----------------
 
+    def _kreis_name(self, ars: str) -> str:
+        name = self._ars_names.get_name(ars) if self._ars_names else None
+        return name or f"ARS {ars}"
+
+    def _fetch_all(self, targets: List[Tuple[str, str]]) -> Iterator[Tuple[str, str, List[Dict[str, Any]]]]:
+        """
+        Yield (ars, kreis_name, items) in target order while the dashboards are fetched
+        concurrently. Stopping early cancels the fetches that have not started yet.
+        """
+        pool = self._pool
+        if pool is None or len(targets) < 2:
+            for ars, kreis_name in targets:
+                yield ars, kreis_name, self._fetch_items(ars)
+            return
+        fetched = pool.map(self._fetch_items, [ars for ars, _ in targets])
+        for (ars, kreis_name), items in zip(targets, fetched):
+            yield ars, kreis_name, items
+
     def _fetch_items(self, ars: str) -> List[Dict[str, Any]]:
         url = self.DASHBOARD_URL.format(ars=ars)
-        data = _http_get_json(url, timeout=25)
+        data = _http_get_json(self._http, url, timeout=25)
         if isinstance(data, list):
             return [x for x in data if isinstance(x, dict)]
         if isinstance(data, dict):
@@ -674,40 +941,31 @@ class NinaWarningsPlugin:
                     return [x for x in v if isinstance(x, dict)]
         return []
 
-    def _format_warning(self, item: Dict[str, Any], ars: str) -> str:
-        title = self._get_title(item)
+    def _format_warning(
+        self,
+        item: Dict[str, Any],
+        ars: str,
+        fields: Optional[ItemFields] = None,
+        kreis_name: Optional[str] = None,
+    ) -> str:
+        """Channel message for an item, or "" if it is filtered; precomputed parts may be passed in."""
+        if fields is None:
+            fields = self._extract_fields(item)
+        title = fields.title
         if not title:
             return ""
 
-        # Best-effort filters (pull sender/category from nested data if available)
-        sender = ""
-        category = ""
-        data = item.get("data")
-        if isinstance(data, dict):
-            snd = data.get("sender")
-            if isinstance(snd, dict):
-                sender = str(snd.get("name") or "").strip()
-            elif isinstance(snd, str):
-                sender = snd.strip()
-            category = str(data.get("provider") or data.get("type") or data.get("category") or "").strip()
-
-        sender = sender or (str(item.get("sender") or "").strip())
-        category = category or (str(item.get("provider") or item.get("type") or item.get("category") or "").strip())
-
-        cat_l = category.lower()
-        snd_l = sender.lower()
-        if (not self.include_police) and ("police" in cat_l or "polizei" in cat_l or "police" in snd_l or "polizei" in snd_l):
-            return ""
-        if (not self.include_dwd) and ("dwd" in cat_l or "wetter" in cat_l or "dwd" in snd_l or "wetter" in snd_l):
-            return ""
-        if (not self.include_mowas) and ("mowas" in cat_l or "katastroph" in cat_l or "mowas" in snd_l):
-            return ""
+        # Best-effort source filters (nothing to check when every source is included).
+        if self._cat_terms:
+            cat_l = fields.category.lower()
+            snd_l = fields.sender.lower()
+            if any(t in cat_l for t in self._cat_terms) or any(t in snd_l for t in self._snd_terms):
+                return ""
 
-        hhmm = _time_hhmm(self._get_sent(item))
+        hhmm = fields.hhmm
 
-        kreis_name = self._ars_names.get_name(ars) if self._ars_names else None
-        if not kreis_name:
-            kreis_name = f"ARS {ars}"
+        if kreis_name is None:
+            kreis_name = self._kreis_name(ars)
 
         return _compact(f"{hhmm} {kreis_name}: {title}", 900)
 